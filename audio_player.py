@@ -0,0 +1,263 @@
+import os
+import time
+import pygame
+
+# Posted by the mixer when the music stream finishes or is stopped
+MUSIC_END_EVENT = pygame.USEREVENT + 1
+
+def supports_extension(extension):
+    """Check whether the mixer can play files with this extension"""
+    extension = extension.lower()
+    if extension in (".mp3", ".ogg", ".wav", ".flac"):
+        return True
+    if extension == ".opus":
+        # Opus support arrived in SDL_mixer 2.0.4
+        return pygame.mixer.get_sdl_mixer_version() >= (2, 0, 4)
+    # SDL_mixer has no AAC decoder
+    return False
+
+class AudioPlayer:
+    def __init__(self):
+        pygame.mixer.init()
+        pygame.mixer.music.set_endevent(MUSIC_END_EVENT)
+        # set_endevent needs SDL's event queue, which lives in the display
+        # subsystem; no window is opened. The dummy video driver provides the
+        # queue without a second native video backend next to Tk (on macOS
+        # both would claim the Cocoa application).
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+        try:
+            pygame.display.init()
+            self.end_event_available = True
+        except pygame.error:
+            self.end_event_available = False
+        self.current_song = None
+        self.queued_song = None
+        # Last song the mixer refused to queue, reported only once
+        self.unqueueable_song = None
+        self.is_playing = False
+        self.is_paused = False
+        self.paused_position = 0
+        # Song position where the stream was last (re)started; get_pos()
+        # counts mixed samples from there and resets on queued switches
+        self.position_offset = 0
+        # Monotonic time at song position 0, used when get_pos() is unavailable
+        self.clock_anchor = time.monotonic()
+        # Song position at the start of the loaded stream; non-zero after
+        # an indexed seek loaded the file from a frame offset
+        self.stream_origin = 0
+        # Optional SeekIndex consulted by seek()
+        self.seek_index = None
+        self.volume = 1.0
+        self.crossfade_channel = None
+        self.crossfade_end = 0
+        self.is_crossfading = False
+
+    def load_audio(self, song_path):
+        self.finish_crossfade()
+        pygame.mixer.music.load(song_path)
+        self.stream_origin = 0
+        self.current_song = song_path
+        self.queued_song = None
+        self.is_paused = False
+        self.paused_position = 0
+        self._reset_clock(0)
+
+    def start_playback(self, start_pos=0):
+        if self.is_paused:
+            pygame.mixer.music.unpause()
+            if self.is_crossfading:
+                self.crossfade_channel.unpause()
+            self.clock_anchor = time.monotonic() - self.paused_position
+        else:
+            self._restart_stream(start_pos)
+        self.is_playing = True
+        self.is_paused = False
+
+    def _restart_stream(self, start_pos):
+        """(Re)start the music stream; play() drops the mixer's queue"""
+        if start_pos < self.stream_origin:
+            # The loaded stream begins past start_pos; go back to the file
+            pygame.mixer.music.load(self.current_song)
+            self.stream_origin = 0
+        pygame.mixer.music.play(start=start_pos - self.stream_origin)
+        self._reset_clock(start_pos)
+        self.clear_end_events()
+        if self.queued_song:
+            pygame.mixer.music.queue(self.queued_song)
+
+    def _load_from_frame(self, byte_offset, frame_time):
+        """
+        Load the current song starting at an MP3 frame boundary
+
+        The decoder then starts right next to the seek target instead of
+        scanning every frame from the beginning of the file.
+        """
+        stream = open(self.current_song, 'rb')
+        stream.seek(byte_offset)
+        # The mixer keeps the file object and closes it when unloading
+        pygame.mixer.music.load(stream, "mp3")
+        self.stream_origin = frame_time
+
+    def _reset_clock(self, position):
+        """Restart the position clock at position seconds into the song"""
+        self.position_offset = position
+        self.clock_anchor = time.monotonic() - position
+
+    def get_position(self):
+        """
+        Get the playback position in seconds within the current song
+
+        Based on the samples the mixer has played since the stream was
+        started, so it stands still while paused and ignores wall clock
+        jumps. Falls back to a monotonic clock while get_pos() is not
+        available.
+        """
+        if self.is_paused:
+            return self.paused_position
+        if not self.is_playing:
+            return 0
+        mixer_pos = pygame.mixer.music.get_pos()
+        if mixer_pos >= 0:
+            return self.position_offset + mixer_pos / 1000
+        return time.monotonic() - self.clock_anchor
+
+    def seek(self, position):
+        """Restart the current song at position, keeping the pause state"""
+        self.finish_crossfade()
+        seek_point = None
+        if self.seek_index is not None:
+            seek_point = self.seek_index.lookup(self.current_song, position)
+
+        if seek_point is not None:
+            self._load_from_frame(*seek_point)
+        self._restart_stream(position)
+        if self.is_paused or not self.is_playing:
+            pygame.mixer.music.pause()
+            self.paused_position = position
+
+    def preload_next(self, song_path):
+        """
+        Queue the song that follows the current one
+
+        The mixer opens the queued file and switches to it the moment the
+        current song ends, without returning to the UI thread first.
+
+        Returns:
+            bool: True if song_path is queued; False leaves the switch to
+                the regular next-track path, which reports unreadable files
+        """
+        # Without end events a queued switch cannot be detected
+        if not self.end_event_available:
+            return False
+        if song_path == self.queued_song:
+            return True
+        try:
+            pygame.mixer.music.queue(song_path)
+        except pygame.error as e:
+            if song_path != self.unqueueable_song:
+                print(f"Error queueing {song_path}: {e}")
+                # Report once; the progress timer asks again every tick
+                self.unqueueable_song = song_path
+            self.queued_song = None
+            return False
+        self.queued_song = song_path
+        return True
+
+    def advance_to_queued(self):
+        """After a track end, adopt the queued song if the mixer started it"""
+        if self.queued_song is None:
+            return False
+        self.current_song = self.queued_song
+        self.queued_song = None
+        self.stream_origin = 0
+        # get_pos() restarted from zero when the mixer switched songs
+        self.position_offset = 0
+        mixer_pos = max(0, pygame.mixer.music.get_pos())
+        self.clock_anchor = time.monotonic() - mixer_pos / 1000
+        return True
+
+    def start_crossfade(self, sound, next_path, offset, length):
+        """
+        Hand over to next_path while sound plays the pre-mixed fade
+
+        The next song starts muted on the music stream, in sync with the
+        fade buffer on a reserved channel. Once the fade is over the music
+        stream is unmuted and the channel stopped, so the hand-over is
+        seamless.
+
+        Args:
+            sound: Pre-mixed fade, already trimmed to start at offset
+            next_path: Song that fades in
+            offset: Seconds into the fade (and into next_path) to start at
+            length: Total fade length in seconds
+        """
+        if self.crossfade_channel is None:
+            pygame.mixer.set_reserved(1)
+            self.crossfade_channel = pygame.mixer.Channel(0)
+
+        pygame.mixer.music.stop()
+        pygame.mixer.music.load(next_path)
+        self.stream_origin = 0
+        self.current_song = next_path
+        self.queued_song = None
+
+        pygame.mixer.music.set_volume(0)
+        self.crossfade_channel.set_volume(self.volume)
+        self.crossfade_channel.play(sound)
+        pygame.mixer.music.play(start=offset)
+        self._reset_clock(offset)
+        self.clear_end_events()
+
+        self.crossfade_end = length
+        self.is_crossfading = True
+        self.is_playing = True
+        self.is_paused = False
+
+    def crossfade_remaining(self):
+        """Seconds left in the running crossfade"""
+        return self.crossfade_end - self.get_position()
+
+    def finish_crossfade(self):
+        """Unmute the music stream and stop the fade buffer"""
+        if not self.is_crossfading:
+            return
+        pygame.mixer.music.set_volume(self.volume)
+        self.crossfade_channel.stop()
+        self.is_crossfading = False
+
+    def clear_end_events(self):
+        """Drop end events posted by restarting or stopping the stream"""
+        if self.end_event_available:
+            pygame.event.clear(MUSIC_END_EVENT)
+
+    def poll_track_end(self):
+        """Check whether the current track finished playing"""
+        if not self.is_playing or self.is_paused:
+            return False
+        if self.end_event_available:
+            return bool(pygame.event.get(MUSIC_END_EVENT))
+        return not pygame.mixer.music.get_busy()
+
+    def suspend_playback(self):
+        self.paused_position = self.get_position()
+        pygame.mixer.music.pause()
+        if self.is_crossfading:
+            self.crossfade_channel.pause()
+        self.is_playing = False
+        self.is_paused = True
+
+    def terminate_playback(self):
+        self.finish_crossfade()
+        pygame.mixer.music.stop()
+        self.clear_end_events()
+        self.queued_song = None
+        self.is_playing = False
+        self.is_paused = False
+        self.paused_position = 0
+
+    def adjust_volume(self, volume):
+        self.volume = volume
+        if self.is_crossfading:
+            self.crossfade_channel.set_volume(volume)
+        else:
+            pygame.mixer.music.set_volume(volume)
@@ -0,0 +1,46 @@
+import os
+import sys
+from metadata import probe_file
+
+class AudioTrack:
+    # Fixed attribute layout keeps 100k-entry playlists compact
+    __slots__ = ('path', 'title', 'source', '_duration')
+
+    # Shared MetadataCache consulted before parsing files
+    metadata_cache = None
+
+    def __init__(self, path, title=None, source="local", duration=None, lazy=False):
+        self.path = path
+        # Sources come from a tiny vocabulary; share one string per value
+        self.source = sys.intern(source)
+        self.title = title or os.path.basename(path)
+        self._duration = duration
+        if duration is None and not lazy:
+            self._duration = self._calculate_duration()
+
+    @property
+    def duration(self):
+        """Track length in seconds, probed on first access for lazy tracks"""
+        if self._duration is None:
+            self._duration = self._calculate_duration()
+        return self._duration
+
+    @duration.setter
+    def duration(self, value):
+        self._duration = value
+
+    @property
+    def duration_known(self):
+        """Whether the duration has been computed yet"""
+        return self._duration is not None
+
+    def _calculate_duration(self):
+        return probe_file(self.path, cache=AudioTrack.metadata_cache)['duration']
+
+def format_track_duration(track):
+    """Format a track duration for display without forcing a probe"""
+    if not track.duration_known:
+        return "--:--"
+    # Same output as time.strftime('%M:%S', ...) without the struct_time
+    minutes, seconds = divmod(int(track.duration), 60)
+    return f"{minutes % 60:02d}:{seconds:02d}"
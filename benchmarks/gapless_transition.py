@@ -0,0 +1,99 @@
+"""
+Track transition benchmark: cold load + play vs. mixer-queued preloading
+
+For each strategy the first file is started one second before its end and
+the benchmark measures how long the mixer reports no music playing
+(the audible gap) and how long the calling thread is blocked performing
+the transition.
+
+Run from the repository root:
+    python -m benchmarks.gapless_transition first.mp3 second.mp3 [rounds]
+
+Set SDL_AUDIODRIVER=dummy and SDL_VIDEODRIVER=dummy to run without
+audio or display hardware.
+"""
+import sys
+import time
+import pygame
+from audio_player import AudioPlayer, MUSIC_END_EVENT
+from metadata import probe_file
+
+POLL_INTERVAL = 0.0005
+
+def wait_for_end_event(timeout):
+    """Spin until the mixer posts its end event"""
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        if pygame.event.get(MUSIC_END_EVENT):
+            return time.perf_counter()
+        time.sleep(POLL_INTERVAL)
+    raise RuntimeError("Track did not end in time")
+
+def cold_transition(player, first, second, lead_in):
+    """Previous behaviour: load and start the next file after the end event"""
+    player.load_audio(first)
+    player.start_playback(start_pos=lead_in)
+    ended_at = wait_for_end_event(5)
+
+    started = time.perf_counter()
+    player.load_audio(second)
+    player.start_playback()
+    blocked = time.perf_counter() - started
+
+    while not pygame.mixer.music.get_busy():
+        time.sleep(POLL_INTERVAL)
+    gap = time.perf_counter() - ended_at
+    player.terminate_playback()
+    return gap, blocked
+
+def queued_transition(player, first, second, lead_in):
+    """Preloaded: the mixer switches to the queued file by itself"""
+    player.load_audio(first)
+    player.start_playback(start_pos=lead_in)
+    player.preload_next(second)
+
+    gap = 0.0
+    silent_since = None
+    deadline = time.perf_counter() + 5
+    while time.perf_counter() < deadline:
+        now = time.perf_counter()
+        if not pygame.mixer.music.get_busy():
+            silent_since = silent_since or now
+        elif silent_since is not None:
+            gap += now - silent_since
+            silent_since = None
+        if pygame.event.get(MUSIC_END_EVENT):
+            break
+        time.sleep(POLL_INTERVAL)
+
+    started = time.perf_counter()
+    player.advance_to_queued()
+    blocked = time.perf_counter() - started
+    player.terminate_playback()
+    return gap, blocked
+
+def main():
+    if len(sys.argv) < 3:
+        print(__doc__)
+        sys.exit(1)
+    first, second = sys.argv[1], sys.argv[2]
+    rounds = int(sys.argv[3]) if len(sys.argv) > 3 else 5
+
+    player = AudioPlayer()
+    if not player.end_event_available:
+        print("Mixer end events unavailable; cannot benchmark queued transitions")
+        sys.exit(1)
+    lead_in = max(0.0, probe_file(first)['duration'] - 1.0)
+
+    for name, strategy in (("cold load+play", cold_transition), ("queued preload", queued_transition)):
+        gaps, blocks = [], []
+        for _ in range(rounds):
+            gap, blocked = strategy(player, first, second, lead_in)
+            gaps.append(gap)
+            blocks.append(blocked)
+        print(f"{name:>15}: gap {sum(gaps) / rounds * 1000:7.2f} ms avg, "
+              f"max {max(gaps) * 1000:7.2f} ms | "
+              f"caller blocked {sum(blocks) / rounds * 1000:7.2f} ms avg")
+
+if __name__ == "__main__":
+    main()
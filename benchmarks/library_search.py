@@ -0,0 +1,107 @@
+"""
+Library search benchmark on a synthetic library
+
+Builds a JsonLibrary with synthetic tracks, indexes it with
+LibrarySearchIndex and times prefix, multi-term and typo queries as well
+as incremental updates through the library.
+
+Run from the repository root:
+    python -m benchmarks.library_search [tracks] [rounds]
+"""
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from library_new import JsonLibrary
+from library_search import LibrarySearchIndex
+
+QUERIES = (
+    "a",
+    "lo",
+    "love",
+    "lvoe",
+    "midnight",
+    "midnigth",
+    "the mid",
+    "love night",
+    "dancing in",
+    "zzzz",
+)
+
+SYLLABLES = ("la", "mi", "do", "re", "ka", "to", "na", "shi", "ro", "ve", "an", "el", "or", "un")
+WORDS = ("love", "night", "midnight", "dancing", "in", "the", "dark", "heart", "fire", "summer",
+         "blue", "dream", "city", "lights", "home", "road", "rain", "gold", "wild", "forever")
+
+def synthetic_word(rng):
+    """A made-up word of two to four syllables"""
+    return "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4)))
+
+def build_library_file(path, tracks, seed=1):
+    """Write a library JSON file with synthetic tracks"""
+    rng = random.Random(seed)
+    vocabulary = list(WORDS) + [synthetic_word(rng) for _ in range(20000)]
+    artists = [f"{synthetic_word(rng).title()} {synthetic_word(rng).title()}" for _ in range(5000)]
+    library = {}
+    for index in range(1, tracks + 1):
+        # Common words make up half of all title words
+        name = " ".join(
+            rng.choice(WORDS) if rng.random() < 0.5 else rng.choice(vocabulary)
+            for _ in range(rng.randint(1, 4))
+        )
+        library[str(index).zfill(2)] = {
+            'name': name.title(),
+            'artist': rng.choice(artists),
+            'file_path': f"/music/{index}.mp3",
+            'rating': rng.randint(0, 5),
+            'play_count': rng.randint(0, 500),
+        }
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(library, f)
+
+def main():
+    tracks = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    rounds = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+
+    with tempfile.TemporaryDirectory() as directory:
+        library_file = os.path.join(directory, "library.json")
+        build_library_file(library_file, tracks)
+        # Journaled so updates below are not dominated by whole-file saves
+        library = JsonLibrary(json_file=library_file, journal=True)
+
+        started = time.perf_counter()
+        index = LibrarySearchIndex(library)
+        print(f"{tracks} tracks indexed in {time.perf_counter() - started:.2f} s")
+
+        for query in QUERIES:
+            timings = []
+            for _ in range(rounds):
+                started = time.perf_counter()
+                results = index.search(query, limit=20)
+                timings.append(time.perf_counter() - started)
+            print(f"{query!r:>14}: median {statistics.median(timings) * 1000:6.2f} ms, "
+                  f"max {max(timings) * 1000:6.2f} ms | {len(results)} results")
+
+        # Incremental updates go through the library's change listeners
+        keys = library.keys()[:rounds]
+        started = time.perf_counter()
+        for key in keys:
+            library.update_rating(key, 5)
+        rating_time = (time.perf_counter() - started) / len(keys)
+        started = time.perf_counter()
+        for number in range(rounds):
+            library.add_track(f"Benchmark Song {number}", "Benchmark Artist", f"/music/new-{number}.mp3")
+        add_time = (time.perf_counter() - started) / rounds
+        started = time.perf_counter()
+        for key in keys:
+            library.remove_track(key)
+        remove_time = (time.perf_counter() - started) / len(keys)
+        print(f"update_rating: {rating_time * 1000:.2f} ms | add_track: {add_time * 1000:.2f} ms | "
+              f"remove_track: {remove_time * 1000:.2f} ms (library and index together)")
+        library.close()
+        print(f"'benchmark song' -> {len(index.search('benchmark song'))} results after adds")
+
+if __name__ == "__main__":
+    main()
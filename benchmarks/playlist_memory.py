@@ -0,0 +1,60 @@
+"""
+Memory benchmark: slot-based AudioTrack vs the previous __dict__ layout
+
+Run from the repository root:
+    python -m benchmarks.playlist_memory [track_count]
+"""
+import os
+import sys
+import tracemalloc
+from audio_track import AudioTrack
+
+class DictAudioTrack:
+    """The previous AudioTrack layout: a plain instance __dict__"""
+    def __init__(self, path, title=None, source="local", duration=None):
+        self.path = path
+        self.source = source
+        self.title = title or os.path.basename(path)
+        self.duration = duration
+
+def measure(track_class, count, build_source=False):
+    """
+    Return bytes allocated to hold a playlist of count tracks
+
+    Paths and titles are built up front so only the track objects and the
+    list holding them are measured. The app passes literal sources, which
+    are shared already; build_source makes a new source string per track,
+    as reading it from a parsed file would, to show the effect of interning.
+    """
+    paths = [f"/music/party/track_{i:06d}.mp3" for i in range(count)]
+    titles = [f"Track {i:06d}" for i in range(count)]
+
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    playlist = [
+        track_class(path, title=title, source=''.join(['lo', 'cal']) if build_source else "local",
+                    duration=180.0)
+        for path, title in zip(paths, titles)
+    ]
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+
+    stats = after.compare_to(before, 'filename')
+    total = sum(stat.size_diff for stat in stats)
+    del playlist
+    return total
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    print(f"Playlist of {count} tracks")
+    for label, build_source in (("literal sources, as the app passes them", False),
+                                ("per-track source strings (interning)", True)):
+        legacy = measure(DictAudioTrack, count, build_source)
+        compact = measure(AudioTrack, count, build_source)
+        print(f"With {label}:")
+        print(f"  __dict__ tracks: {legacy / 1024 / 1024:8.2f} MiB ({legacy / count:6.1f} B/track)")
+        print(f"  __slots__ tracks: {compact / 1024 / 1024:7.2f} MiB ({compact / count:6.1f} B/track)")
+        print(f"  Saved: {(1 - compact / legacy) * 100:.1f}%")
+
+if __name__ == "__main__":
+    main()
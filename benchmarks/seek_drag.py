@@ -0,0 +1,108 @@
+"""
+Seek drag benchmark: render per motion event vs. SeekController coalescing
+
+Feeds a synthetic drag (motion events at a fixed rate on a virtual clock)
+to both strategies. Rendering is simulated by a busy wait standing in for
+the progress bar and label redraw. Reports how many drag events per
+second each strategy can handle, how many renders and seeks it issued.
+
+Run from the repository root:
+    python -m benchmarks.seek_drag [events] [event_rate_hz] [render_cost_us]
+"""
+import heapq
+import sys
+import time
+from seek_controller import SeekController
+
+class VirtualScheduler:
+    def __init__(self):
+        """Timer queue driven by a virtual clock, standing in for Tk's after()"""
+        self.now_ms = 0.0
+        self.jobs = []
+        self.counter = 0
+        self.cancelled = set()
+
+    def after(self, delay_ms, callback):
+        """Schedule callback delay_ms from now and return its handle"""
+        self.counter += 1
+        heapq.heappush(self.jobs, (self.now_ms + delay_ms, self.counter, callback))
+        return self.counter
+
+    def after_cancel(self, handle):
+        """Cancel a scheduled callback"""
+        self.cancelled.add(handle)
+
+    def advance(self, now_ms):
+        """Run every job due by now_ms"""
+        while self.jobs and self.jobs[0][0] <= now_ms:
+            due, handle, callback = heapq.heappop(self.jobs)
+            self.now_ms = due
+            if handle not in self.cancelled:
+                callback()
+        self.now_ms = now_ms
+
+def busy_wait(seconds):
+    """Burn CPU for the given time, like a widget redraw would"""
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
+
+def drag_positions(events):
+    """Fractions of a drag sweeping across the whole bar"""
+    return [index / (events - 1) for index in range(events)]
+
+def run_direct(positions, render_cost):
+    """Previous behaviour: every motion event redraws the widgets"""
+    counts = {'renders': 0, 'seeks': 0}
+
+    def render(fraction):
+        counts['renders'] += 1
+        busy_wait(render_cost)
+
+    started = time.perf_counter()
+    for fraction in positions:
+        render(fraction)
+    counts['seeks'] += 1
+    return time.perf_counter() - started, counts
+
+def run_controller(positions, interval_ms, render_cost):
+    """Coalesced: renders once per frame, seeks once on release"""
+    scheduler = VirtualScheduler()
+    counts = {'renders': 0, 'seeks': 0}
+
+    def render(fraction):
+        counts['renders'] += 1
+        busy_wait(render_cost)
+
+    def seek(fraction):
+        counts['seeks'] += 1
+
+    controller = SeekController(scheduler.after, scheduler.after_cancel, render, seek)
+
+    started = time.perf_counter()
+    controller.press(positions[0])
+    for index, fraction in enumerate(positions[1:-1], start=1):
+        scheduler.advance(index * interval_ms)
+        controller.move(fraction)
+    scheduler.advance((len(positions) - 1) * interval_ms)
+    controller.release(positions[-1])
+    return time.perf_counter() - started, counts
+
+def main():
+    events = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    rate = float(sys.argv[2]) if len(sys.argv) > 2 else 500.0
+    render_cost = (float(sys.argv[3]) if len(sys.argv) > 3 else 500.0) / 1_000_000
+    interval_ms = 1000.0 / rate
+    positions = drag_positions(events)
+
+    print(f"{events} motion events at {rate:.0f} Hz "
+          f"({events / rate:.1f} s drag), {render_cost * 1e6:.0f} us per render")
+    for name, (elapsed, counts) in (
+        ("per event", run_direct(positions, render_cost)),
+        ("coalesced", run_controller(positions, interval_ms, render_cost)),
+    ):
+        print(f"{name:>10}: {events / elapsed:12.0f} events/s handled | "
+              f"{counts['renders']:5d} renders | {counts['seeks']} seek(s)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Seek benchmark: play(start=...) from the file start vs. seek-table offsets
+
+Builds the seek table for a (preferably long, VBR) MP3 file, then seeks
+to several positions with and without the table and reports how long the
+calling thread is blocked by each seek.
+
+Run from the repository root:
+    python -m benchmarks.seek_index long.mp3 [rounds]
+
+Set SDL_AUDIODRIVER=dummy and SDL_VIDEODRIVER=dummy to run without
+audio or display hardware.
+"""
+import sys
+import time
+from audio_player import AudioPlayer
+from seek_index import SeekIndex, build_seek_table
+
+TARGETS = (0.1, 0.5, 0.9, 0.99)
+
+def time_seeks(player, duration, rounds):
+    """Average blocking time of a seek for each target fraction"""
+    results = []
+    for fraction in TARGETS:
+        position = duration * fraction
+        total = 0.0
+        for _ in range(rounds):
+            started = time.perf_counter()
+            player.seek(position)
+            total += time.perf_counter() - started
+        results.append((position, total / rounds, player.get_position()))
+    return results
+
+def main():
+    if len(sys.argv) < 2:
+        print(__doc__)
+        sys.exit(1)
+    path = sys.argv[1]
+    rounds = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+
+    started = time.perf_counter()
+    table = build_seek_table(path)
+    build_time = time.perf_counter() - started
+    if table is None:
+        print("No MPEG audio frames found")
+        sys.exit(1)
+    duration = table['duration']
+    print(f"seek table: {len(table['offsets'])} points for {duration / 60:.1f} min "
+          f"built in {build_time * 1000:.1f} ms")
+
+    player = AudioPlayer()
+    player.load_audio(path)
+    player.start_playback()
+
+    seek_index = SeekIndex()
+    seek_index.prepare(path, duration)
+    seek_index.executor.shutdown(wait=True)
+
+    for name, index in (("play(start=)", None), ("seek table", seek_index)):
+        player.seek_index = index
+        for position, blocked, reported in time_seeks(player, duration, rounds):
+            print(f"{name:>13} -> {position:8.1f} s: blocked {blocked * 1000:8.2f} ms avg, "
+                  f"clock reads {reported:8.1f} s")
+
+    player.terminate_playback()
+
+if __name__ == "__main__":
+    main()
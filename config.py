@@ -0,0 +1,78 @@
+# Jukebox configuration
+
+# Library storage backend: "json" or "sqlite"
+LIBRARY_BACKEND = "json"
+LIBRARY_JSON_FILE = "02_library.json"
+LIBRARY_DB_FILE = "02_library.db"
+
+# JSON backend persistence settings
+LIBRARY_WRITE_BEHIND = True
+LIBRARY_FLUSH_INTERVAL = 2.0
+LIBRARY_FLUSH_THRESHOLD = 50
+LIBRARY_JOURNAL = True
+LIBRARY_COMPACT_THRESHOLD = 1000
+
+# Tracks listed for a library search
+LIBRARY_SEARCH_RESULTS = 50
+
+# Number of files probed concurrently when importing
+METADATA_PROBE_WORKERS = 8
+
+# Probed metadata cache, keyed by path, size and mtime
+METADATA_CACHE_FILE = "metadata_cache.json"
+METADATA_CACHE_SIZE = 50000
+
+# Upcoming playlist entries whose durations are probed ahead of time
+DURATION_PREFETCH_AHEAD = 5
+
+# Interval at which updates from worker threads are applied to the UI
+UI_FRAME_MS = 33
+
+# Progress display refresh interval while a track is playing
+PROGRESS_UPDATE_MS = 200
+
+# Concurrent YouTube downloads, and retries of a failed download with a
+# backoff delay (seconds) that doubles on every further attempt
+DOWNLOAD_WORKERS = 3
+DOWNLOAD_RETRIES = 2
+DOWNLOAD_RETRY_BACKOFF = 2.0
+
+# Output codec of downloads: "auto" (Opus pass-through when the player
+# supports it, otherwise MP3), "mp3", "opus" or "m4a"; re-encodes use
+# DOWNLOAD_BITRATE. Transcodes run in TRANSCODE_WORKERS processes
+# (None: one per CPU core).
+DOWNLOAD_CODEC = "auto"
+DOWNLOAD_BITRATE = "192k"
+TRANSCODE_WORKERS = None
+
+# Downloaded files by extractor and video ID, so videos are fetched once
+DOWNLOAD_INDEX_FILE = "download_index.json"
+
+# YouTube search: results per query, type-ahead delay after the last
+# keystroke, and a persisted result cache with a time-to-live in seconds
+SEARCH_MAX_RESULTS = 5
+SEARCH_MIN_CHARS = 3
+SEARCH_DEBOUNCE_MS = 400
+SEARCH_CACHE_FILE = "search_cache.json"
+SEARCH_CACHE_SIZE = 500
+SEARCH_CACHE_TTL = 86400
+
+# Minimum interval between progress bar redraws while dragging to seek
+SEEK_DRAG_FRAME_MS = 16
+
+# Queue the next playlist entry in the mixer for gapless transitions
+GAPLESS_PLAYBACK = True
+
+# DJ-style crossfades between tracks (needs NumPy and FFmpeg)
+CROSSFADE_ENABLED = False
+CROSSFADE_SECONDS = 6.0
+# "equal_power" or "linear"
+CROSSFADE_CURVE = "equal_power"
+
+# MP3 seek tables for tracks longer than SEEK_INDEX_MIN_DURATION seconds,
+# with a seek point every SEEK_INDEX_INTERVAL seconds
+SEEK_INDEX_MIN_DURATION = 600
+SEEK_INDEX_INTERVAL = 1.0
+# One file per table, read only when its track plays
+SEEK_INDEX_CACHE_DIR = "seek_index_cache"
+SEEK_INDEX_CACHE_SIZE = 200
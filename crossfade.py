@@ -0,0 +1,146 @@
+import math
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+import pygame
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+def linear_curve(t):
+    """Fade-out and fade-in gains for linear crossfades"""
+    return 1.0 - t, t
+
+def equal_power_curve(t):
+    """Fade-out and fade-in gains keeping perceived loudness constant"""
+    return np.cos(t * math.pi / 2), np.sin(t * math.pi / 2)
+
+FADE_CURVES = {
+    'linear': linear_curve,
+    'equal_power': equal_power_curve,
+}
+
+def decode_segment(path, start, length, sample_rate, channels):
+    """
+    Decode part of an audio file to 16-bit PCM with FFmpeg
+
+    Returns:
+        int16 array of shape (frames, channels)
+    """
+    command = [
+        'ffmpeg', '-v', 'error',
+        '-ss', f"{max(0.0, start):.3f}",
+        '-t', f"{length:.3f}",
+        '-i', path,
+        '-f', 's16le',
+        '-acodec', 'pcm_s16le',
+        '-ac', str(channels),
+        '-ar', str(sample_rate),
+        '-'
+    ]
+    result = subprocess.run(command, capture_output=True, check=True)
+    samples = np.frombuffer(result.stdout, dtype=np.int16)
+    return samples[:len(samples) - len(samples) % channels].reshape(-1, channels)
+
+class CrossfadePlan:
+    def __init__(self, current_path, next_path, start_time, samples, sample_rate):
+        """
+        A pre-mixed crossfade between two tracks
+
+        Args:
+            current_path: Track fading out
+            next_path: Track fading in
+            start_time: Position in the current track where the fade starts
+            samples: Mixed int16 PCM covering the whole fade
+            sample_rate: Mixer sample rate of samples
+        """
+        self.current_path = current_path
+        self.next_path = next_path
+        self.start_time = start_time
+        self.samples = samples
+        self.sample_rate = sample_rate
+
+    @property
+    def length(self):
+        """Length of the fade in seconds"""
+        return len(self.samples) / self.sample_rate
+
+    def sound_from(self, offset):
+        """Build a Sound for the fade, skipping offset seconds into it"""
+        first_frame = min(len(self.samples), max(0, int(offset * self.sample_rate)))
+        samples = self.samples[first_frame:]
+        # make_sound wants (frames,) for a mono mixer, (frames, channels) otherwise
+        channels = pygame.mixer.get_init()[2]
+        if samples.shape[1] != channels:
+            mono = samples.mean(axis=1).astype(np.int16)
+            samples = mono[:, None].repeat(channels, axis=1)
+        if channels == 1:
+            samples = samples[:, 0]
+        return pygame.sndarray.make_sound(np.ascontiguousarray(samples))
+
+class CrossfadeEngine:
+    def __init__(self, fade_seconds=6.0, curve="equal_power"):
+        """
+        Initialize the crossfade engine
+
+        Tails and heads are decoded and mixed on a worker thread; the UI
+        thread only ever picks up a finished plan.
+
+        Args:
+            fade_seconds: Length of the crossfade
+            curve: Name of a fade curve in FADE_CURVES
+        """
+        self.fade_seconds = fade_seconds
+        self.curve = FADE_CURVES[curve]
+        self.available = np is not None
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="crossfade")
+        self._pending = None
+        self._pending_key = None
+
+    def prepare(self, current_path, current_duration, next_path):
+        """Start mixing a crossfade from current_path into next_path"""
+        key = (current_path, next_path)
+        if not self.available or key == self._pending_key:
+            return
+        if current_duration <= self.fade_seconds * 2:
+            # Too short to fade out of without cutting the track in half
+            return
+        self._pending_key = key
+        self._pending = self.executor.submit(
+            self._build_plan, current_path, current_duration, next_path
+        )
+
+    def _build_plan(self, current_path, current_duration, next_path):
+        """Decode the tail and head and mix them with the fade curve"""
+        sample_rate, _, channels = pygame.mixer.get_init()
+        start_time = current_duration - self.fade_seconds
+
+        tail = decode_segment(current_path, start_time, self.fade_seconds, sample_rate, channels)
+        head = decode_segment(next_path, 0, self.fade_seconds, sample_rate, channels)
+
+        frames = max(len(tail), len(head))
+        tail = np.pad(tail, ((0, frames - len(tail)), (0, 0)))
+        head = np.pad(head, ((0, frames - len(head)), (0, 0)))
+
+        fade_out, fade_in = self.curve(np.linspace(0.0, 1.0, frames, dtype=np.float32))
+        mixed = tail * fade_out[:, None] + head * fade_in[:, None]
+        samples = np.clip(mixed, -32768, 32767).astype(np.int16)
+        return CrossfadePlan(current_path, next_path, start_time, samples, sample_rate)
+
+    def ready_plan(self, current_path, next_path):
+        """Get the finished plan for this pair, or None without blocking"""
+        if (self._pending_key != (current_path, next_path) or self._pending is None
+                or not self._pending.done()):
+            return None
+        try:
+            return self._pending.result()
+        except Exception as e:
+            # Report once; the pair stays marked so prepare() won't retry it
+            print(f"Crossfade preparation error: {e}")
+            self._pending = None
+            return None
+
+    def shutdown(self):
+        """Stop the worker thread"""
+        self.executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,76 @@
+import json
+import os
+import re
+import threading
+from json_store import write_json_atomic
+
+# Video IDs in the common YouTube URL forms
+YOUTUBE_ID_PATTERN = re.compile(
+    r'(?:youtube\.com/(?:watch\?(?:.*&)?v=|shorts/|embed/)|youtu\.be/)([A-Za-z0-9_-]{11})'
+)
+
+def media_key(extractor, media_id):
+    """Build the index key of a video, e.g. 'youtube:dQw4w9WgXcQ'"""
+    return f"{extractor.lower()}:{media_id}"
+
+def key_from_url(url):
+    """Get the index key of a YouTube URL without a network request, or None"""
+    match = YOUTUBE_ID_PATTERN.search(url)
+    return media_key("youtube", match.group(1)) if match else None
+
+class DownloadIndex:
+    def __init__(self, index_file="download_index.json"):
+        """
+        Initialize the download index
+
+        Maps extractor:video-id keys to downloaded files, so a video is
+        fetched and transcoded only once.
+
+        Args:
+            index_file: Path of the JSON index file
+        """
+        self.index_file = index_file
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()
+        self.entries = self._load_index()
+
+    def _load_index(self):
+        """Load index entries from disk"""
+        try:
+            if os.path.exists(self.index_file):
+                with open(self.index_file, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+        except Exception as e:
+            print(f"Error loading download index: {e}")
+        return {}
+
+    def get(self, key):
+        """Get the downloaded file for key, or None if missing or deleted"""
+        with self._lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            if not os.path.exists(entry['path']):
+                # Deleted from disk since; download it again
+                del self.entries[key]
+                return None
+            return entry['path']
+
+    def put(self, key, path, title=None):
+        """Record the downloaded file for key and save the index"""
+        with self._lock:
+            self.entries[key] = {'path': path, 'title': title}
+        # Snapshot under the save lock so a stale snapshot never wins
+        with self._save_lock:
+            with self._lock:
+                snapshot = dict(self.entries)
+            self._save(snapshot)
+
+    def _save(self, snapshot):
+        """Write the index to disk atomically"""
+        try:
+            write_json_atomic(self.index_file, snapshot, prefix=".download-index-", indent=2)
+            return True
+        except Exception as e:
+            print(f"Error saving download index: {e}")
+            return False
@@ -0,0 +1,284 @@
+import heapq
+import itertools
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+
+class DownloadCancelled(Exception):
+    """Raised inside a download when its job was cancelled"""
+
+class SharedDownload:
+    def __init__(self, progress_callback=None):
+        """
+        A download shared by every request for the same item
+
+        Passed to yt-dlp as the progress hook. Each progress update goes to
+        every subscriber's callback; a subscriber whose callback raises
+        DownloadCancelled is dropped, and the download is only aborted once
+        the last subscriber has cancelled.
+
+        Args:
+            progress_callback: Progress hook of the first request, or None
+        """
+        self.future = Future()
+        self._lock = threading.Lock()
+        # Subscribers without a callback can never cancel
+        self._callbacks = [progress_callback]
+
+    def subscribe(self, progress_callback=None):
+        """Add another request to the download and return its Future"""
+        with self._lock:
+            self._callbacks.append(progress_callback)
+        return self.future
+
+    def __call__(self, d):
+        with self._lock:
+            callbacks = list(self._callbacks)
+        for callback in callbacks:
+            if callback is None:
+                continue
+            try:
+                callback(d)
+            except DownloadCancelled:
+                with self._lock:
+                    self._callbacks.remove(callback)
+        with self._lock:
+            if not self._callbacks:
+                raise DownloadCancelled()
+
+class DownloadJob:
+    def __init__(self, job_id, query, label, priority=0):
+        """
+        A queued download
+
+        Args:
+            job_id: Unique job number
+            query: URL or yt-dlp search query passed to the fetch function
+            label: Text shown for the job in the UI
+            priority: Lower values are downloaded first
+        """
+        self.job_id = job_id
+        self.query = query
+        self.label = label
+        self.priority = priority
+        self.status = "queued"
+        self.progress = 0.0
+        self.attempts = 0
+        self.error = None
+        self.result_path = None
+        self.cancel_event = threading.Event()
+        self.retry_timer = None
+
+    @property
+    def finished(self):
+        """Whether the job is done, failed or cancelled"""
+        return self.status in ("done", "failed", "cancelled")
+
+class DownloadManager:
+    def __init__(self, fetch, max_workers=3, max_retries=2, retry_backoff=2.0, on_finished=None):
+        """
+        Initialize the download manager
+
+        Jobs wait in a priority queue (FIFO within a priority) and at most
+        max_workers of them download at a time.
+
+        Args:
+            fetch: Function (query, progress_callback) -> output path, or
+                a Future of it when later stages (e.g. transcoding) run
+                elsewhere; e.g. YoutubeAudioDownloader.fetch_audio
+            max_workers: Number of concurrent downloads
+            max_retries: Retries of a failed download before giving up
+            retry_backoff: Delay before the first retry; doubled for each
+                further retry
+            on_finished: Called with each job once it is done, failed or
+                cancelled, from a worker thread
+        """
+        self.fetch = fetch
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.on_finished = on_finished
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="download")
+
+        self._lock = threading.Lock()
+        self._queue = []
+        self._sequence = itertools.count()
+        self._job_ids = itertools.count(1)
+        self.jobs = {}
+
+    def submit(self, query, label=None, priority=0):
+        """Queue a download and return its DownloadJob"""
+        with self._lock:
+            job = DownloadJob(next(self._job_ids), query, label or query, priority)
+            self.jobs[job.job_id] = job
+        self._enqueue(job)
+        return job
+
+    def _enqueue(self, job):
+        """Push a job onto the queue and give the pool a task to pick it up"""
+        with self._lock:
+            heapq.heappush(self._queue, (job.priority, next(self._sequence), job))
+        self.executor.submit(self._run_next)
+
+    def prioritize(self, job_id, priority=-1):
+        """Move a queued job ahead of jobs with a higher priority value"""
+        with self._lock:
+            job = self.jobs.get(job_id)
+            if job is None or job.status != "queued":
+                return False
+            job.priority = priority
+            # The old entry is skipped when popped since its priority is stale
+            heapq.heappush(self._queue, (priority, next(self._sequence), job))
+            return True
+
+    def _pop_job(self):
+        """Take the best queued job off the queue, or None"""
+        with self._lock:
+            while self._queue:
+                priority, _, job = heapq.heappop(self._queue)
+                if job.status == "queued" and priority == job.priority:
+                    job.status = "downloading"
+                    return job
+            return None
+
+    def _run_next(self):
+        """Worker task: download the best queued job"""
+        job = self._pop_job()
+        if job is None:
+            return
+
+        def progress_hook(d):
+            if job.cancel_event.is_set():
+                # yt-dlp aborts the download when a hook raises
+                raise DownloadCancelled()
+            if d['status'] == 'downloading':
+                total = d.get('total_bytes') or d.get('total_bytes_estimate') or 0
+                if total > 0:
+                    job.progress = d.get('downloaded_bytes', 0) / total
+            elif d['status'] == 'finished':
+                job.progress = 1.0
+                job.status = "processing"
+
+        job.attempts += 1
+        try:
+            result = self.fetch(job.query, progress_callback=progress_hook)
+        except Exception as e:
+            self._handle_failure(job, e)
+            return
+
+        if isinstance(result, Future):
+            # Free this worker for the next download while later stages run
+            job.progress = 1.0
+            job.status = "processing"
+            result.add_done_callback(lambda f: self._complete_stage(job, f))
+        else:
+            self._handle_success(job, result)
+
+    def _complete_stage(self, job, future):
+        """Finish a job whose later stages completed"""
+        try:
+            path = future.result()
+        except Exception as e:
+            self._handle_failure(job, e)
+            return
+        self._handle_success(job, path)
+
+    def _handle_success(self, job, path):
+        """Record the output of a finished job"""
+        job.result_path = path
+        if job.cancel_event.is_set():
+            self._finish(job, "cancelled")
+        else:
+            self._finish(job, "done")
+
+    def _handle_failure(self, job, error):
+        """Retry a failed job, or give up after max_retries"""
+        if job.cancel_event.is_set():
+            self._finish(job, "cancelled")
+        elif job.attempts <= self.max_retries:
+            self._schedule_retry(job, error)
+        else:
+            job.error = str(error)
+            self._finish(job, "failed")
+
+    def _schedule_retry(self, job, error):
+        """Re-queue a failed job after an exponential backoff delay"""
+        delay = self.retry_backoff * 2 ** (job.attempts - 1)
+        job.error = str(error)
+        job.progress = 0.0
+        job.status = "retrying"
+
+        def requeue():
+            with self._lock:
+                if job.status != "retrying":
+                    return
+                job.status = "queued"
+                job.retry_timer = None
+            self._enqueue(job)
+
+        job.retry_timer = threading.Timer(delay, requeue)
+        job.retry_timer.daemon = True
+        job.retry_timer.start()
+
+    def _finish(self, job, status):
+        """Record the final state of a job and report it"""
+        job.status = status
+        if self.on_finished:
+            try:
+                self.on_finished(job)
+            except Exception as e:
+                print(f"Download callback error: {e}")
+
+    def cancel(self, job_id):
+        """Cancel a queued, waiting or running download"""
+        with self._lock:
+            job = self.jobs.get(job_id)
+            if job is None or job.finished:
+                return False
+            job.cancel_event.set()
+            if job.status in ("queued", "retrying"):
+                # Not running; no worker will report it
+                job.status = "cancelled"
+                if job.retry_timer is not None:
+                    job.retry_timer.cancel()
+                    job.retry_timer = None
+                waiting = True
+            else:
+                waiting = False
+        if waiting:
+            self._finish(job, "cancelled")
+        return True
+
+    def job_list(self):
+        """Get all known jobs in submission order"""
+        with self._lock:
+            return list(self.jobs.values())
+
+    def cancel_all(self):
+        """Cancel every unfinished download"""
+        for job in self.job_list():
+            self.cancel(job.job_id)
+
+    def clear_finished(self):
+        """Forget jobs that are done, failed or cancelled"""
+        with self._lock:
+            for job_id in [job_id for job_id, job in self.jobs.items() if job.finished]:
+                del self.jobs[job_id]
+
+    def summary(self):
+        """
+        Get aggregated progress over all unfinished jobs
+
+        Returns:
+            (active, queued, progress) where progress is the mean progress
+            of unfinished jobs, or 1.0 if there are none
+        """
+        with self._lock:
+            pending = [job for job in self.jobs.values() if not job.finished]
+        active = sum(1 for job in pending if job.status in ("downloading", "processing"))
+        queued = len(pending) - active
+        progress = sum(job.progress for job in pending) / len(pending) if pending else 1.0
+        return active, queued, progress
+
+    def shutdown(self):
+        """Cancel all downloads and stop the worker pool"""
+        self.cancel_all()
+        self.executor.shutdown(wait=False, cancel_futures=True)
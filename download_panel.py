@@ -0,0 +1,174 @@
+import customtkinter as ctk
+
+STATUS_TEXT = {
+    "queued": "Queued",
+    "downloading": "Downloading",
+    "processing": "Processing audio",
+    "retrying": "Retrying",
+    "done": "Done",
+    "failed": "Failed",
+    "cancelled": "Cancelled",
+}
+
+class DownloadPanel:
+    def __init__(self, parent, manager, refresh_ms=250):
+        """
+        Initialize the download progress panel
+
+        One window shows every queued and running download together with
+        the overall progress. It reads the manager's job states on a timer
+        while open, so worker threads never touch its widgets.
+
+        Args:
+            parent: Parent window (CTk root)
+            manager: DownloadManager whose jobs are shown
+            refresh_ms: Interval between two refreshes
+        """
+        self.parent = parent
+        self.manager = manager
+        self.refresh_ms = refresh_ms
+        self.dialog = None
+        self.refresh_job = None
+        # job_id -> (row frame, label, progress bar, cancel button, shown state)
+        self.rows = {}
+
+    def show(self):
+        """Open the panel, or bring it to the front"""
+        if self.dialog is None or not self.dialog.winfo_exists():
+            self._create_dialog()
+        else:
+            self.dialog.deiconify()
+            self.dialog.lift()
+        self.schedule_refresh()
+
+    def _create_dialog(self):
+        """Create the panel window and its widgets"""
+        self.dialog = ctk.CTkToplevel(self.parent)
+        self.dialog.title("Downloads")
+        self.dialog.geometry("500x400")
+        self.rows = {}
+
+        # Center the panel
+        x = self.parent.winfo_x() + (self.parent.winfo_width() - 500) // 2
+        y = self.parent.winfo_y() + (self.parent.winfo_height() - 400) // 2
+        self.dialog.geometry(f"+{x}+{y}")
+
+        self._create_widgets()
+        self.dialog.protocol("WM_DELETE_WINDOW", self.hide)
+
+    def _create_widgets(self):
+        """Create the summary, job list and buttons"""
+        self.summary_label = ctk.CTkLabel(
+            self.dialog,
+            text="No downloads",
+            font=("Helvetica", 14)
+        )
+        self.summary_label.pack(pady=(15, 5))
+
+        self.overall_bar = ctk.CTkProgressBar(self.dialog)
+        self.overall_bar.pack(pady=5, padx=20, fill="x")
+        self.overall_bar.set(0)
+
+        self.jobs_frame = ctk.CTkScrollableFrame(self.dialog)
+        self.jobs_frame.pack(pady=10, padx=20, fill="both", expand=True)
+
+        self.button_frame = ctk.CTkFrame(self.dialog, fg_color="transparent")
+        self.button_frame.pack(pady=10)
+
+        ctk.CTkButton(
+            self.button_frame,
+            text="Clear Finished",
+            command=self.clear_finished,
+            width=100
+        ).pack(side="left", padx=5)
+
+        ctk.CTkButton(
+            self.button_frame,
+            text="Cancel All",
+            command=self.manager.cancel_all,
+            width=100
+        ).pack(side="left", padx=5)
+
+    def hide(self):
+        """Hide the panel; downloads keep running"""
+        self.dialog.withdraw()
+
+    def schedule_refresh(self):
+        """Start the refresh timer if it is not running"""
+        if self.refresh_job is None:
+            self.refresh_job = self.parent.after(0, self.refresh)
+
+    def refresh(self):
+        """Sync the widgets with the manager's jobs"""
+        self.refresh_job = None
+        if self.dialog is None or not self.dialog.winfo_exists():
+            return
+
+        jobs = self.manager.job_list()
+        for job in jobs:
+            self._update_row(job)
+        current_ids = {job.job_id for job in jobs}
+        for job_id in [job_id for job_id in self.rows if job_id not in current_ids]:
+            self.rows.pop(job_id)[0].destroy()
+
+        active, queued, progress = self.manager.summary()
+        if active or queued:
+            self.summary_label.configure(text=f"{active} in progress, {queued} waiting")
+            self.overall_bar.set(progress)
+        else:
+            self.summary_label.configure(text="All downloads finished" if jobs else "No downloads")
+            self.overall_bar.set(1 if jobs else 0)
+
+        # Keep polling while something is still running
+        if active or queued:
+            self.refresh_job = self.parent.after(self.refresh_ms, self.refresh)
+
+    def _update_row(self, job):
+        """Create or update the row of a job, if its state changed"""
+        state = (job.status, round(job.progress, 2), job.attempts)
+        row = self.rows.get(job.job_id)
+        if row is None:
+            row = self._create_row(job)
+        elif row[4] == state:
+            return
+
+        frame, label, bar, cancel_button, _ = row
+        status = STATUS_TEXT.get(job.status, job.status)
+        if job.status == "failed" and job.error:
+            status = f"{status}: {job.error}"
+        elif job.attempts > 1 and not job.finished:
+            status = f"{status} (attempt {job.attempts})"
+        label.configure(text=f"{job.label}\n{status}")
+        bar.set(job.progress)
+        if job.finished:
+            cancel_button.configure(state="disabled")
+        self.rows[job.job_id] = (frame, label, bar, cancel_button, state)
+
+    def _create_row(self, job):
+        """Create the widgets showing one job"""
+        frame = ctk.CTkFrame(self.jobs_frame)
+        frame.pack(pady=4, fill="x")
+
+        label = ctk.CTkLabel(frame, text=job.label, anchor="w", justify="left", font=("Helvetica", 12))
+        label.pack(side="top", padx=10, pady=(5, 0), fill="x")
+
+        bar = ctk.CTkProgressBar(frame)
+        bar.pack(side="left", padx=10, pady=5, fill="x", expand=True)
+        bar.set(0)
+
+        cancel_button = ctk.CTkButton(
+            frame,
+            text="Cancel",
+            command=lambda job_id=job.job_id: self.manager.cancel(job_id),
+            width=70
+        )
+        cancel_button.pack(side="right", padx=10, pady=5)
+
+        row = (frame, label, bar, cancel_button, None)
+        self.rows[job.job_id] = row
+        return row
+
+    def clear_finished(self):
+        """Remove finished jobs from the panel"""
+        self.manager.clear_finished()
+        self.schedule_refresh()
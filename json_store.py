@@ -0,0 +1,109 @@
+import json
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+
+def write_json_atomic(path, data, prefix=".json-", fsync=False, **dump_args):
+    """
+    Write data to path as JSON atomically (temp file + rename)
+
+    Readers see either the old file or the complete new one. The temp file
+    is removed if writing fails and the error is re-raised.
+
+    Args:
+        path: Destination file
+        data: JSON-serializable data
+        prefix: Name prefix of the temp file
+        fsync: Flush the data to disk before the rename
+        dump_args: Extra json.dump arguments, e.g. indent
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(prefix=prefix, suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, **dump_args)
+            if fsync:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+class LRUJsonCache:
+    def __init__(self, cache_file, max_entries, name="cache"):
+        """
+        Initialize a least-recently-used cache persisted as one JSON file
+
+        Subclasses build keys and entries and decide when an entry is
+        still valid.
+
+        Args:
+            cache_file: Path of the JSON cache file
+            max_entries: Entries kept before the least recently used are evicted
+            name: Name used in error messages
+        """
+        self.cache_file = cache_file
+        self.max_entries = max_entries
+        self.name = name
+        self._lock = threading.Lock()
+        self._dirty = False
+        self.entries = self._load_cache()
+
+    def _is_valid(self, entry):
+        """Check whether a stored entry may still be served"""
+        return True
+
+    def _load_cache(self):
+        """Load valid cache entries from disk"""
+        try:
+            if os.path.exists(self.cache_file):
+                with open(self.cache_file, 'r', encoding='utf-8') as f:
+                    return OrderedDict(
+                        (key, entry) for key, entry in json.load(f) if self._is_valid(entry)
+                    )
+        except Exception as e:
+            print(f"Error loading {self.name}: {e}")
+        return OrderedDict()
+
+    def _get_entry(self, key, is_valid=None):
+        """Get the entry for key, dropping it if is_valid (or _is_valid) rejects it"""
+        is_valid = is_valid or self._is_valid
+        with self._lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            if not is_valid(entry):
+                del self.entries[key]
+                self._dirty = True
+                return None
+            self.entries.move_to_end(key)
+            return entry
+
+    def _put_entry(self, key, entry):
+        """Store entry under key, evicting the least recently used"""
+        with self._lock:
+            self.entries[key] = entry
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+            self._dirty = True
+
+    def save(self):
+        """Write the cache to disk atomically if it changed"""
+        with self._lock:
+            if not self._dirty:
+                return True
+            snapshot = list(self.entries.items())
+            self._dirty = False
+
+        try:
+            write_json_atomic(self.cache_file, snapshot, prefix=".cache-")
+            return True
+        except Exception as e:
+            print(f"Error saving {self.name}: {e}")
+            with self._lock:
+                self._dirty = True
+            return False
@@ -1,74 +1,46 @@
 import customtkinter as ctk
 from tkinter import messagebox, filedialog
-import pygame
 import os
-from mutagen.mp3 import MP3
 import time
-from threading import Thread
-from youtube_search import YoutubeSearch
+import threading
+from concurrent.futures import Future
 import string
 import yt_dlp
 from library_new import JsonLibrary
+from library_sqlite import SqliteLibrary
+from metadata import MetadataCache, MetadataProber
+from audio_track import AudioTrack, format_track_duration
 from PIL import Image
 from rating import ModernRatingDialog
+from playlist_view import VirtualPlaylistView
+from playlist import Playlist
+from audio_player import AudioPlayer, supports_extension
+from seek_index import SeekIndex, SeekTableStore
+from seek_controller import SeekController
+from download_manager import DownloadManager, SharedDownload
+from download_panel import DownloadPanel
+from download_index import DownloadIndex, key_from_url, media_key
+from transcode import OUTPUT_CODECS, Transcoder, transcode_audio
+from search_service import SearchCache, SearchService
+from ui_dispatcher import UIDispatcher
+from crossfade import CrossfadeEngine
+from library_search import LibrarySearchIndex
+import config
 
 # Set the appearance mode and default color theme
 ctk.set_appearance_mode("dark")
 ctk.set_default_color_theme("blue")
 
-class AudioPlayer:
-    def __init__(self):
-        pygame.mixer.init()
-        self.current_song = None
-        self.is_playing = False
-        self.is_paused = False
-        self.paused_position = 0
-        self.current_position = 0
-
-    def load_audio(self, song_path):
-        pygame.mixer.music.load(song_path)
-        self.current_song = song_path
-        self.paused_position = 0
-
-    def start_playback(self, start_pos=0):
-        if self.is_paused:
-            pygame.mixer.music.unpause()
-        else:
-            pygame.mixer.music.play(start=start_pos)
-        self.is_playing = True
-        self.is_paused = False
-
-    def suspend_playback(self):
-        pygame.mixer.music.pause()
-        self.is_playing = False
-        self.is_paused = True
-
-    def terminate_playback(self):
-        pygame.mixer.music.stop()
-        self.is_playing = False
-        self.is_paused = False
-        self.current_position = 0
-
-    def adjust_volume(self, volume):
-        pygame.mixer.music.set_volume(volume)
-
-class AudioTrack:
-    def __init__(self, path, title=None, source="local"):
-        self.path = path
-        self.source = source
-        self.title = title or os.path.basename(path)
-        self.duration = self._calculate_duration()
-
-    def _calculate_duration(self):
-        try:
-            audio = MP3(self.path)
-            return audio.info.length
-        except:
-            return 0
-
 class YoutubeAudioDownloader:
-    def __init__(self, download_path="downloads"):
+    def __init__(self, download_path="downloads", index=None, transcoder=None, codec="mp3", bitrate="192k"):
         self.download_path = download_path
+        self.index = index
+        self.transcoder = transcoder
+        self.codec = codec
+        self.bitrate = bitrate
+        self._lock = threading.Lock()
+        # Index key -> SharedDownload in progress
+        self._in_flight = {}
         if not os.path.exists(download_path):
             os.makedirs(download_path)
     
@@ -78,49 +50,217 @@ class YoutubeAudioDownloader:
         return filename[:50]
     
     def fetch_audio(self, url, progress_callback=None):
+        """
+        Download the audio of a video and hand it to the transcode stage
+
+        Returns:
+            Future of the path of the playable file
+        """
+        # Known video URLs are answered without touching the network
+        if self.index is not None:
+            key = key_from_url(url)
+            if key:
+                existing = self.index.get(key)
+                if existing:
+                    return self._completed(existing)
+
+        shared = SharedDownload(progress_callback)
         try:
             ydl_opts = {
-                'format': 'bestaudio/best',
-                'postprocessors': [{
-                    'key': 'FFmpegExtractAudio',
-                    'preferredcodec': 'mp3',
-                    'preferredquality': '192',
-                }],
-                'outtmpl': os.path.join(self.download_path, '%(title)s.%(ext)s'),
-                'progress_hooks': [progress_callback] if progress_callback else None,
+                'format': OUTPUT_CODECS[self.codec]['format'],
+                # The ID keeps videos with the same title apart
+                'outtmpl': os.path.join(self.download_path, '%(title)s [%(id)s].%(ext)s'),
+                # Aborts only once every request sharing the download cancelled
+                'progress_hooks': [shared],
                 'default_search': 'ytsearch',
             }
             
             with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                info = ydl.extract_info(url, download=True)
+                # Resolve searches and URLs to a video before downloading
+                info = ydl.extract_info(url, download=False)
                 if 'entries' in info:
-                    info = info['entries'][0]
-                filename = ydl.prepare_filename(info)
-                mp3_path = os.path.splitext(filename)[0] + '.mp3'
-                return mp3_path
-                
+                    info = next(iter(info['entries']))
+
+                key = media_key(info['extractor_key'], info['id'])
+                with self._lock:
+                    # Identical requests share the first one's download
+                    if key in self._in_flight:
+                        return self._in_flight[key].subscribe(progress_callback)
+                    existing = self.index.get(key) if self.index is not None else None
+                    if existing:
+                        return self._completed(existing)
+                    result = shared.future
+                    self._in_flight[key] = shared
+
+                try:
+                    info = ydl.process_ie_result(info, download=True)
+                    source_path = ydl.prepare_filename(info)
+                except Exception as e:
+                    self._resolve(key, result, error=e)
+                    raise
+
         except Exception as e:
             raise Exception(f"Download failed: {str(e)}")
 
+        # Transcoding runs on its own, freeing the download worker
+        source_codec = info.get('acodec')
+        if self.transcoder is None:
+            try:
+                output_path = transcode_audio(source_path, self.codec, source_codec, self.bitrate)
+            except Exception as e:
+                self._resolve(key, result, error=e)
+                raise Exception(f"Transcode failed: {str(e)}")
+            self._resolve(key, result, output_path, info.get('title'))
+        else:
+            transcode = self.transcoder.submit(source_path, self.codec, source_codec, self.bitrate)
+            transcode.add_done_callback(
+                lambda f: self._finish_transcode(key, result, f, info.get('title'))
+            )
+        return result
+
+    @staticmethod
+    def _completed(path):
+        """Wrap an existing file in a finished Future"""
+        future = Future()
+        future.set_result(path)
+        return future
+
+    def _finish_transcode(self, key, result, transcode, title):
+        """Resolve a download's Future once its transcode finished"""
+        try:
+            output_path = transcode.result()
+        except Exception as e:
+            self._resolve(key, result, error=Exception(f"Transcode failed: {str(e)}"))
+            return
+        self._resolve(key, result, output_path, title)
+
+    def _resolve(self, key, result, path=None, title=None, error=None):
+        """Record the outcome of a download and release identical requests"""
+        if error is None and self.index is not None:
+            self.index.put(key, path, title)
+        with self._lock:
+            self._in_flight.pop(key, None)
+        if error is None:
+            result.set_result(path)
+        else:
+            result.set_exception(error)
+
 class ModernJukeboxInterface:
     def __init__(self):
         self.window = ctk.CTk()
         self.window.title("Modern Jukebox")
         self.window.geometry("1200x800")
+        self.ui_dispatcher = UIDispatcher(self.window, frame_ms=config.UI_FRAME_MS)
         
-        self.music_library = JsonLibrary()
+        self.music_library = self._create_music_library()
+        # Indexed off the Tk thread so large libraries don't delay startup
+        self.library_search = LibrarySearchIndex(
+            self.music_library,
+            background=True,
+            on_ready=lambda: self.ui_dispatcher.post("library_search_ready", self._library_search_ready)
+        )
         self.audio_player = AudioPlayer()
-        self.downloader = YoutubeAudioDownloader()
-        self.playlist = []
+        self.crossfade_engine = None
+        if config.CROSSFADE_ENABLED:
+            self.crossfade_engine = CrossfadeEngine(
+                fade_seconds=config.CROSSFADE_SECONDS,
+                curve=config.CROSSFADE_CURVE
+            )
+        self.download_index = DownloadIndex(config.DOWNLOAD_INDEX_FILE)
+        self.transcoder = Transcoder(max_workers=config.TRANSCODE_WORKERS)
+        self.downloader = YoutubeAudioDownloader(
+            index=self.download_index,
+            transcoder=self.transcoder,
+            codec=self._choose_download_codec(),
+            bitrate=config.DOWNLOAD_BITRATE
+        )
+        self.download_manager = DownloadManager(
+            fetch=self.downloader.fetch_audio,
+            max_workers=config.DOWNLOAD_WORKERS,
+            max_retries=config.DOWNLOAD_RETRIES,
+            retry_backoff=config.DOWNLOAD_RETRY_BACKOFF,
+            on_finished=self._handle_download_finished
+        )
+        self.download_panel = DownloadPanel(self.window, self.download_manager)
+        self.search_cache = SearchCache(
+            cache_file=config.SEARCH_CACHE_FILE,
+            max_entries=config.SEARCH_CACHE_SIZE,
+            ttl=config.SEARCH_CACHE_TTL
+        )
+        self.search_service = SearchService(
+            cache=self.search_cache,
+            max_results=config.SEARCH_MAX_RESULTS
+        )
+        self.search_job = None
+        self.latest_search_query = None
+        self.latest_library_query = None
+        self.metadata_cache = MetadataCache(
+            cache_file=config.METADATA_CACHE_FILE,
+            max_entries=config.METADATA_CACHE_SIZE
+        )
+        AudioTrack.metadata_cache = self.metadata_cache
+        self.metadata_prober = MetadataProber(
+            max_workers=config.METADATA_PROBE_WORKERS,
+            cache=self.metadata_cache
+        )
+        self.seek_index_cache = SeekTableStore(
+            directory=config.SEEK_INDEX_CACHE_DIR,
+            max_entries=config.SEEK_INDEX_CACHE_SIZE
+        )
+        self.seek_index = SeekIndex(
+            cache=self.seek_index_cache,
+            interval=config.SEEK_INDEX_INTERVAL,
+            min_duration=config.SEEK_INDEX_MIN_DURATION
+        )
+        self.audio_player.seek_index = self.seek_index
+        self.playlist = Playlist()
         self.current_track_index = -1
-        self.is_seeking = False
-        self.playback_start_time = 0
-        self.seek_position = 0
+        self.seek_controller = SeekController(
+            schedule=self.window.after,
+            cancel=self.window.after_cancel,
+            render=self.render_seek_preview,
+            seek=self.apply_seek,
+            on_drag_start=self.stop_progress_updates,
+            on_drag_end=self.schedule_progress_update,
+            frame_ms=config.SEEK_DRAG_FRAME_MS
+        )
 
         self.selected_track_index = -1
+        self.selected_track = None
+        self.playlist_refresh_pending = False
+        self.pending_duration_probes = set()
 
         self._initialize_interface()
         self._initialize_progress_updater()
+        self.ui_dispatcher.start()
+        self.window.protocol("WM_DELETE_WINDOW", self.shutdown_application)
+    def _choose_download_codec(self):
+        """Pick the configured download codec, if the player can play it"""
+        codec = config.DOWNLOAD_CODEC
+        if codec == "auto":
+            # Opus pass-through avoids a lossy re-encode
+            return "opus" if supports_extension(".opus") else "mp3"
+        if not supports_extension(OUTPUT_CODECS[codec]['ext']):
+            print(f"Player cannot play {codec} files; downloading as mp3")
+            return "mp3"
+        return codec
+
+    def _create_music_library(self):
+        """Create the library backend selected in config"""
+        if config.LIBRARY_BACKEND == "sqlite":
+            return SqliteLibrary(
+                db_file=config.LIBRARY_DB_FILE,
+                json_file=config.LIBRARY_JSON_FILE
+            )
+        return JsonLibrary(
+            json_file=config.LIBRARY_JSON_FILE,
+            write_behind=config.LIBRARY_WRITE_BEHIND,
+            flush_interval=config.LIBRARY_FLUSH_INTERVAL,
+            flush_threshold=config.LIBRARY_FLUSH_THRESHOLD,
+            journal=config.LIBRARY_JOURNAL,
+            compact_threshold=config.LIBRARY_COMPACT_THRESHOLD
+        )
+
     def _initialize_interface(self):
         # Main container initialization
         self.main_frame = ctk.CTkFrame(self.window)
@@ -140,6 +280,8 @@ class ModernJukeboxInterface:
             width=400
         )
         self.search_entry.pack(side="left", padx=10)
+        self.search_entry.bind("<KeyRelease>", self.schedule_type_ahead_search)
+        self.search_entry.bind("<Return>", lambda e: self.search_youtube_content())
 
         self.search_button = ctk.CTkButton(
             self.search_frame,
@@ -208,12 +350,23 @@ class ModernJukeboxInterface:
         )
         self.playlist_label.pack(padx=5)
 
-        self.playlist_box = ctk.CTkTextbox(
+        self.jump_to_current_button = ctk.CTkButton(
             self.playlist_frame,
+            text="Jump to Current",
+            command=self.jump_to_current_track,
+            width=100
+        )
+        self.jump_to_current_button.pack(pady=5)
+
+        self.playlist_view = VirtualPlaylistView(
+            self.playlist_frame,
+            row_count=lambda: len(self.playlist),
+            format_row=self._format_playlist_line,
+            on_select=self.handle_playlist_selection,
+            on_activate=self.play_playlist_track,
             height=300
         )
-        self.playlist_box.pack(fill="both", expand=True, padx=10, pady=5)
-        self.playlist_box.bind('<Button-1>', self.handle_playlist_selection)
+        self.playlist_view.pack(fill="both", expand=True, padx=10, pady=5)
 
         # Library section setup
         self.library_frame = ctk.CTkFrame(self.content_frame)
@@ -226,11 +379,19 @@ class ModernJukeboxInterface:
         )
         self.library_label.pack(pady=5)
 
+        self.library_search_entry = ctk.CTkEntry(
+            self.library_frame,
+            placeholder_text="Search library"
+        )
+        self.library_search_entry.pack(fill="x", padx=10, pady=5)
+        self.library_search_entry.bind("<KeyRelease>", self.search_library)
+
         self.library_box = ctk.CTkTextbox(
             self.library_frame,
             height=300
         )
         self.library_box.pack(fill="both", expand=True, padx=10, pady=5)
+        self.library_box.bind('<Double-Button-1>', self.select_library_result)
 
         # Playback controls setup
         self.controls_frame = ctk.CTkFrame(self.main_frame)
@@ -251,6 +412,9 @@ class ModernJukeboxInterface:
         )
         self.progress_bar.pack(pady=5)
         self.progress_bar.set(0)
+        self.progress_bar.bind("<Button-1>", self.initiate_seek)
+        self.progress_bar.bind("<B1-Motion>", self.update_seek_position)
+        self.progress_bar.bind("<ButtonRelease-1>", self.finalize_seek)
 
         # Time tracking display
         self.time_label = ctk.CTkLabel(
@@ -339,125 +503,137 @@ class ModernJukeboxInterface:
         self.volume_slider.set(0.5)  # Default volume 50%
 
     def _initialize_progress_updater(self):
-        def update_progress():
-            while True:
-                if self.audio_player.is_playing and not self.audio_player.is_paused:
-                    try:
-                        elapsed_time = time.time() - self.playback_start_time
-                        current_track = self.playlist[self.current_track_index]
-                        
-                        # Calculate and bound progress between 0 and 1
-                        progress = (elapsed_time / current_track.duration) if current_track.duration > 0 else 0
-                        progress = min(1.0, max(0, progress))
-
-                        # Update UI elements in the main thread
-                        self.window.after(0, lambda: (
-                            self.progress_bar.set(progress),
-                            self.time_label.configure(text=f"{time.strftime('%M:%S', time.gmtime(elapsed_time))} / {time.strftime('%M:%S', time.gmtime(current_track.duration))}")
-                        ))
-
-                        # Check if track has finished playing
-                        if elapsed_time >= current_track.duration:
-                            self.window.after(0, self.play_next_track)
-
-                    except Exception as e:
-                        print(f"Progress update error: {e}")
-
-                time.sleep(0.1)
-
-        self.update_thread = Thread(target=update_progress, daemon=True)
-        self.update_thread.start()
+        """Set up the timer that drives the progress display"""
+        self.progress_job = None
+        self.crossfade_job = None
+        self.displayed_progress = None
+        self.displayed_time_text = None
+
+    def schedule_progress_update(self):
+        """Start the progress timer; it stops itself when playback halts"""
+        if self.progress_job is None:
+            self.progress_job = self.window.after(0, self._update_progress)
+
+    def stop_progress_updates(self):
+        """Stop the progress timer so it leaves the widgets alone"""
+        if self.progress_job is not None:
+            self.window.after_cancel(self.progress_job)
+            self.progress_job = None
+
+    def _update_progress(self):
+        """Refresh progress widgets and detect the end of the track"""
+        self.progress_job = None
+        if not self.audio_player.is_playing or self.audio_player.is_paused:
+            # Sleep until playback is started or resumed
+            return
+
+        if self.audio_player.poll_track_end():
+            if self.audio_player.advance_to_queued():
+                self._continue_with_queued_track()
+            else:
+                self.play_next_track()
+            return
+
+        try:
+            # Entries may have been added after the current track started
+            self.preload_next_track()
+
+            if self.audio_player.is_crossfading:
+                self._schedule_crossfade_check(self._finish_crossfade_when_due, 0)
+            else:
+                self._check_crossfade_start()
+
+            current_track = self.playlist[self.current_track_index]
+            self.display_position(self.audio_player.get_position(), current_track.duration)
+        except Exception as e:
+            print(f"Progress update error: {e}")
+        finally:
+            # A crossfade start may already have restarted the timer
+            if self.progress_job is None:
+                self.progress_job = self.window.after(config.PROGRESS_UPDATE_MS, self._update_progress)
+
+    def display_position(self, position, duration):
+        """Show a playback position, touching only widgets whose value changed"""
+        # Calculate and bound progress between 0 and 1
+        progress = (position / duration) if duration > 0 else 0
+        progress = round(min(1.0, max(0, progress)), 3)
+        time_text = f"{time.strftime('%M:%S', time.gmtime(position))} / {time.strftime('%M:%S', time.gmtime(duration))}"
+
+        if progress != self.displayed_progress:
+            self.progress_bar.set(progress)
+            self.displayed_progress = progress
+        if time_text != self.displayed_time_text:
+            self.time_label.configure(text=time_text)
+            self.displayed_time_text = time_text
+
+    def reset_position_display(self):
+        """Show an empty position for when nothing is playing"""
+        self.progress_bar.set(0)
+        self.time_label.configure(text="0:00 / 0:00")
+        self.displayed_progress = None
+        self.displayed_time_text = None
+
+    def _seek_fraction(self, event):
+        """Get the progress bar fraction under the pointer"""
+        progress_width = max(1, self.progress_bar.winfo_width())
+        return max(0, min(event.x, progress_width)) / progress_width
 
     def initiate_seek(self, event):
         """Initialize seeking operation when progress bar is clicked"""
         if self.current_track_index >= 0:
-            self.is_seeking = True
-            self.update_seek_position(event)
+            self.seek_controller.press(self._seek_fraction(event))
 
     def update_seek_position(self, event):
-        """Update seek position while dragging"""
-        if self.current_track_index >= 0 and self.is_seeking:
-            progress_width = self.progress_bar.winfo_width()
-            relative_x = max(0, min(event.x, progress_width))
-            seek_ratio = relative_x / progress_width
-            
-            current_track = self.playlist[self.current_track_index]
-            new_position = seek_ratio * current_track.duration
-            
-            # Update visual feedback
-            self.progress_bar.set(seek_ratio)
-            
-            # Update time display
-            current_str = time.strftime('%M:%S', time.gmtime(new_position))
-            duration_str = time.strftime('%M:%S', time.gmtime(current_track.duration))
-            self.time_label.configure(text=f"{current_str} / {duration_str}")
-
-            self.seek_position = new_position
+        """Record the drag position; the controller renders it once per frame"""
+        self.seek_controller.move(self._seek_fraction(event))
 
     def finalize_seek(self, event):
         """Complete the seeking operation"""
-        if self.current_track_index >= 0 and self.is_seeking:
-            self.is_seeking = False
-            was_playing = self.audio_player.is_playing and not self.audio_player.is_paused
-            
-            # Apply the seek operation
-            pygame.mixer.music.play(start=self.seek_position)
-            
-            # Restore previous playback state
-            if not was_playing:
-                pygame.mixer.music.pause()
-            
-            # Update timing reference
-            self.playback_start_time = time.time() - self.seek_position
+        self.seek_controller.release(self._seek_fraction(event))
+
+    def render_seek_preview(self, fraction):
+        """Show the position being dragged to"""
+        if self.current_track_index >= 0:
+            duration = self.playlist[self.current_track_index].duration
+            self.display_position(fraction * duration, duration)
+
+    def apply_seek(self, fraction):
+        """Seek the mixer to the position the drag ended at"""
+        if self.current_track_index >= 0:
+            self.audio_player.seek(fraction * self.playlist[self.current_track_index].duration)
 
     def adjust_playback_position(self, seconds):
         """Adjust playback position by relative number of seconds"""
         if self.current_track_index >= 0:
-            current_time = time.time() - self.playback_start_time
+            current_time = self.audio_player.get_position()
             current_track = self.playlist[self.current_track_index]
             
             # Calculate and bound new position
             new_position = max(0, min(current_track.duration, current_time + seconds))
             
-            # Store playback state
-            was_playing = self.audio_player.is_playing and not self.audio_player.is_paused
-            
             # Apply new position
-            pygame.mixer.music.play(start=new_position)
-            
-            if not was_playing:
-                pygame.mixer.music.pause()
-            
-            # Update timing reference and progress display
-            self.playback_start_time = time.time() - new_position
-            self.seek_position = new_position
-            
-            if current_track.duration > 0:
-                self.progress_bar.set(new_position / current_track.duration)
-            
-            # Update time display
-            current_str = time.strftime('%M:%S', time.gmtime(new_position))
-            duration_str = time.strftime('%M:%S', time.gmtime(current_track.duration))
-            self.time_label.configure(text=f"{current_str} / {duration_str}")
+            self.audio_player.seek(new_position)
+            self.display_position(new_position, current_track.duration)
 
     def toggle_playback(self):
         """Toggle between play and pause states"""
         if self.current_track_index < 0 and self.playlist:
-            # Start playing first track if none is playing
+            # Start playing the selected track, or the first one
             self.current_track_index = 0
+            self._apply_playlist_selection()
             self.start_playback()
         elif self.audio_player.is_playing:
             # Pause current track
-            self.audio_player.current_position = time.time() - self.playback_start_time
             self.audio_player.suspend_playback()
             self.play_button.configure(text="▶")
         else:
             # Resume playback
             if self.audio_player.is_paused:
-                self.playback_start_time = time.time() - self.audio_player.current_position
                 self.audio_player.start_playback()
                 self.play_button.configure(text="⏸")
+                self.schedule_progress_update()
             else:
+                self._apply_playlist_selection()
                 self.start_playback()
 
     def play_next_track(self):
@@ -467,16 +643,13 @@ class ModernJukeboxInterface:
             self.start_playback()
             
             # Update display
-            self.refresh_playlist_display()
-            current_pos = float(self.current_track_index) + 1
-            self.playlist_box.see(f"{current_pos}")
+            self.jump_to_current_track()
         else:
             # End of playlist reached
             self.audio_player.terminate_playback()
             self.play_button.configure(text="▶")
             self.now_playing_label.configure(text="No song playing")
-            self.progress_bar.set(0)
-            self.time_label.configure(text="0:00 / 0:00")
+            self.reset_position_display()
 
     def play_previous_track(self):
         """Play the previous track in the playlist"""
@@ -485,54 +658,74 @@ class ModernJukeboxInterface:
             self.start_playback()
             
             # Update display
-            self.refresh_playlist_display()
-            current_pos = float(self.current_track_index) + 1
-            self.playlist_box.see(f"{current_pos}")
+            self.jump_to_current_track()
         else:
             # At start of playlist, restart current track
             self.start_playback()
 
+    def schedule_type_ahead_search(self, event=None):
+        """Search once typing pauses for a moment"""
+        if self.search_job is not None:
+            self.window.after_cancel(self.search_job)
+            self.search_job = None
+
+        query = self.search_entry.get().strip()
+        if len(query) < config.SEARCH_MIN_CHARS or query.startswith(('http://', 'https://')):
+            return
+        if query == self.latest_search_query:
+            # Cursor movement and the like; nothing new to search
+            return
+        self.search_job = self.window.after(config.SEARCH_DEBOUNCE_MS, self.search_youtube_content)
+
     def search_youtube_content(self):
         """Search YouTube for content based on user query"""
+        if self.search_job is not None:
+            self.window.after_cancel(self.search_job)
+            self.search_job = None
+
         query = self.search_entry.get().strip()
         if not query:
             return
-                
-        try:
-            # Clear previous results
-            self.search_results.delete("1.0", "end")
-            
-            # Show searching indicator
-            self.search_results.insert("1.0", "Searching...")
-            self.search_results.update()
-            
-            # Execute search
-            results = YoutubeSearch(query, max_results=5).to_dict()
-            
-            # Clear searching indicator
-            self.search_results.delete("1.0", "end")
-            
-            # Display formatted results
-            for i, result in enumerate(results, 1):
-                title = result['title']
-                duration = result.get('duration', 'Unknown duration')
-                channel = result.get('channel', 'Unknown channel')
-                url = f"https://youtube.com/watch?v={result['id']}"
-                
-                result_text = (f"{i}. {title}\n"
-                            f"   Duration: {duration} | Channel: {channel}\n"
-                            f"   URL: {url}\n\n")
-                
-                self.search_results.insert("end", result_text)
-            
-            # Add usage instructions
-            self.search_results.insert("end", "-" * 50 + "\n")
-            self.search_results.insert("end", "Double-click a result to download\n")
-            
-        except Exception as e:
-            self.display_error_message("Search Error", str(e))
+        self.latest_search_query = query
+
+        # Show searching indicator
+        self.search_results.delete("1.0", "end")
+        self.search_results.insert("1.0", "Searching...")
+
+        self.search_service.search(
+            query,
+            # Keyed by query: an older search finishing in the same frame
+            # must not replace the result of the latest one
+            lambda results, error: self.ui_dispatcher.post(
+                ("search_results", query), self._show_search_results, query, results, error
+            )
+        )
+
+    def _show_search_results(self, query, results, error):
+        """Display the results of a finished search"""
+        if query != self.latest_search_query:
+            # A newer search replaced this one
+            return
+
+        self.search_results.delete("1.0", "end")
+        if error is not None:
+            self.latest_search_query = None
+            self.display_error_message("Search Error", str(error))
             # Auto-clear error after delay
             self.window.after(3000, lambda: self.search_results.delete("1.0", "end"))
+            return
+
+        # Display formatted results
+        for i, result in enumerate(results, 1):
+            url = f"https://youtube.com/watch?v={result['id']}"
+            result_text = (f"{i}. {result['title']}\n"
+                        f"   Duration: {result['duration']} | Channel: {result['channel']}\n"
+                        f"   URL: {url}\n\n")
+            self.search_results.insert("end", result_text)
+
+        # Add usage instructions
+        self.search_results.insert("end", "-" * 50 + "\n")
+        self.search_results.insert("end", "Double-click a result to download\n")
 
     def download_selected_track(self, event):
         """Handle download of selected search result"""
@@ -554,104 +747,29 @@ class ModernJukeboxInterface:
             print(f"Download selection error: {e}")
 
     def initiate_youtube_download(self):
-        """Download audio from YouTube URL or search query"""
+        """Queue a download of a YouTube URL or search query"""
         query = self.search_entry.get().strip()
         if not query:
             return
 
+        label = query
         # Convert search terms to YouTube search if not URL
         if not query.startswith(('http://', 'https://')):
             query = f"ytsearch1:{query}"
 
-        try:
-            # Create download progress window
-            progress_window = ctk.CTkToplevel(self.window)
-            progress_window.title("Downloading...")
-            progress_window.geometry("400x200")
-        
-            # Center progress window
-            x = self.window.winfo_x() + (self.window.winfo_width() - 400) // 2
-            y = self.window.winfo_y() + (self.window.winfo_height() - 200) // 2
-            progress_window.geometry(f"+{x}+{y}")
-        
-            # Progress indicators
-            progress_label = ctk.CTkLabel(
-                progress_window,
-                text="Downloading audio...",
-                font=("Helvetica", 14)
-            )
-            progress_label.pack(pady=20)
-            
-            progress_bar = ctk.CTkProgressBar(progress_window)
-            progress_bar.pack(pady=20, padx=40, fill="x")
-            progress_bar.set(0)
-            
-            status_label = ctk.CTkLabel(
-                progress_window,
-                text="Starting download...",
-                font=("Helvetica", 12)
-            )
-            status_label.pack(pady=10)
-
-            def update_progress(d):
-                """Handle download progress updates"""
-                if d['status'] == 'downloading':
-                    try:
-                        total = d.get('total_bytes') or d.get('total_bytes_estimate', 0)
-                        downloaded = d.get('downloaded_bytes', 0)
-                        
-                        if total > 0:
-                            # Update progress visualization
-                            progress = downloaded / total
-                            self.window.after(0, lambda: progress_bar.set(progress))
-                            
-                            # Update status with speed and ETA
-                            speed = d.get('speed', 0)
-                            if speed:
-                                speed_mb = speed / (1024 * 1024)
-                                eta = d.get('eta', 0)
-                                status_text = f"Speed: {speed_mb:.1f} MB/s | ETA: {eta} seconds"
-                                self.window.after(0, lambda: status_label.configure(text=status_text))
-                                
-                    except Exception as e:
-                        print(f"Progress update error: {e}")
-            
-                elif d['status'] == 'finished':
-                    self.window.after(0, lambda: status_label.configure(text="Processing audio..."))
-        
-            def download_thread():
-                """Execute download in separate thread"""
-                try:
-                    # Download audio file
-                    output_path = self.downloader.fetch_audio(
-                        query,
-                        progress_callback=update_progress
-                    )
-                    
-                    # Create track object and add to playlist
-                    track = AudioTrack(output_path, source="youtube")
-                    self.playlist.append(track)
-                    
-                    # Update UI
-                    self.window.after(0, self.refresh_playlist_display)
-                    self.window.after(0, progress_window.destroy)
-                    self.window.after(0, lambda: self.display_info_message(
-                        "Success",
-                        "Track downloaded and added to playlist!"
-                    ))
-                    
-                except Exception as e:
-                    self.window.after(0, progress_window.destroy)
-                    self.window.after(0, lambda: self.display_error_message(
-                        "Download Error",
-                        str(e)
-                    ))
-            
-            # Launch download thread
-            Thread(target=download_thread, daemon=True).start()
-        
-        except Exception as e:
-            self.display_error_message("Download Error", str(e))
+        self.download_manager.submit(query, label=label)
+        self.download_panel.show()
+
+    def _handle_download_finished(self, job):
+        """Add a finished download to the playlist (called from a worker thread)"""
+        if job.status == "done":
+            track = AudioTrack(job.result_path, source="youtube")
+            self.ui_dispatcher.call(self._add_downloaded_track, track)
+
+    def _add_downloaded_track(self, track):
+        """Append a downloaded track to the playlist"""
+        if self.playlist.append(track):
+            self.refresh_playlist_display()
 
     def retrieve_library_track(self):
         """Retrieve and display track information from library"""
@@ -688,6 +806,51 @@ class ModernJukeboxInterface:
             self.library_box.insert("1.0", f"Track {track_id} not found")
             self.current_library_track = None
 
+    def search_library(self, event=None):
+        """List the library tracks matching the search entry as the user types"""
+        query = self.library_search_entry.get().strip()
+        if query == self.latest_library_query:
+            return
+        self.latest_library_query = query
+        if not query:
+            self.library_box.delete("1.0", "end")
+            return
+        if not self.library_search.ready.is_set():
+            self.library_box.delete("1.0", "end")
+            self.library_box.insert("1.0", "Indexing library...")
+            return
+
+        lines = []
+        for key in self.library_search.search(query, limit=config.LIBRARY_SEARCH_RESULTS):
+            name = self.music_library.get_name(key)
+            if name is None:
+                continue
+            rating = self.music_library.get_rating(key)
+            lines.append(
+                f"{key} | {name} - {self.music_library.get_artist(key)} | "
+                f"{'★' * rating}{'☆' * (5-rating)} | {self.music_library.get_play_count(key)} plays"
+            )
+        self.library_box.delete("1.0", "end")
+        self.library_box.insert("1.0", "\n".join(lines) if lines else f"No tracks match '{query}'")
+
+    def _library_search_ready(self):
+        """Run the pending library search once the index is built"""
+        if self.latest_library_query:
+            self.latest_library_query = None
+            self.search_library()
+
+    def select_library_result(self, event):
+        """Show the library track of a double-clicked search result"""
+        line_num = int(float(self.library_box.index("@%d,%d" % (event.x, event.y))))
+        line = self.library_box.get(f"{line_num}.0", f"{line_num}.end")
+        key = line.split(" | ", 1)[0].strip()
+        if " | " not in line or self.music_library.get_name(key) is None:
+            return
+        self.track_id_entry.delete(0, "end")
+        self.track_id_entry.insert(0, key)
+        self.latest_library_query = None
+        self.retrieve_library_track()
+
     def initiate_library_playback(self, event=None):
         """Start playback of a track from the library"""
         if not hasattr(self, 'current_library_track') or self.current_library_track is None:
@@ -705,15 +868,11 @@ class ModernJukeboxInterface:
             )
             
             # Add to playlist if not present
-            if track.path not in [t.path for t in self.playlist]:
-                self.playlist.append(track)
+            if self.playlist.append(track):
                 self.refresh_playlist_display()
             
             # Find track index in playlist
-            for i, t in enumerate(self.playlist):
-                if t.path == track.path:
-                    self.current_track_index = i
-                    break
+            self.current_track_index = self.playlist.index_of(track.path)
             
             # Start playback
             self.start_playback()
@@ -730,34 +889,79 @@ class ModernJukeboxInterface:
             filetypes=[("MP3 Files", "*.mp3")]
         )
         
+        if not file_paths:
+            return
+
+        # Enqueue lazily; durations show as placeholders until probed
+        imported_tracks = {}
         for path in file_paths:
-            # Create track object
-            track = AudioTrack(path, source="local")
-            
-            # Check for existing track in library
-            track_exists = False
-            for key in self.music_library.library.keys():
-                if self.music_library.get_file_path(key) == path:
-                    track_exists = True
-                    break
-            
-            # Add to library if new
-            if not track_exists:
-                next_id = str(len(self.music_library.library) + 1).zfill(2)
-                self.music_library.library[next_id] = {
-                    'name': os.path.basename(path),
-                    'artist': 'Unknown',
-                    'file_path': path,
-                    'rating': 0,
-                    'play_count': 0
-                }
-                self.music_library._save_library()
-            
-            # Add to playlist if not present
-            if track.path not in [t.path for t in self.playlist]:
+            if path not in self.playlist:
+                track = AudioTrack(path, source="local", lazy=True)
+                imported_tracks[path] = (len(self.playlist), track)
                 self.playlist.append(track)
-        
-        # Update display
+        self.refresh_playlist_display()
+
+        # Probe files in the background; details fill in as they finish
+        self.pending_duration_probes.update(imported_tracks)
+        self.metadata_prober.probe_many(
+            file_paths,
+            on_result=lambda metadata: self.ui_dispatcher.post(
+                ("metadata", metadata['path']),
+                self._apply_probed_metadata,
+                metadata, *imported_tracks.get(metadata['path'], (None, None))
+            ),
+            on_done=lambda results: self.ui_dispatcher.call(self._finish_local_import, results)
+        )
+
+    def _apply_probed_metadata(self, metadata, index, track):
+        """Fill in details of the playlist track at index from probed metadata"""
+        self.pending_duration_probes.discard(metadata['path'])
+        if track is None:
+            return
+        track.duration = metadata['duration']
+        if metadata.get('title'):
+            track.title = metadata['title']
+
+        # The playlist may have been cleared since the probe started
+        if index < len(self.playlist) and self.playlist[index] is track:
+            if self.playlist_view.is_row_visible(index):
+                self.schedule_playlist_refresh()
+
+    def prefetch_track_durations(self, start, end):
+        """Probe unknown durations of playlist entries start..end in the background"""
+        for index in range(max(0, start), min(end, len(self.playlist))):
+            track = self.playlist[index]
+            if track.duration_known or track.path in self.pending_duration_probes:
+                continue
+            self.pending_duration_probes.add(track.path)
+            future = self.metadata_prober.probe(track.path)
+            future.add_done_callback(
+                lambda f, i=index, t=track: self.ui_dispatcher.post(
+                    ("metadata", t.path), self._apply_probed_metadata, f.result(), i, t
+                )
+            )
+
+    def _finish_local_import(self, results):
+        """Add all probed files to the library with a single save"""
+        self.music_library.add_tracks(
+            {
+                'name': metadata['title'] or os.path.basename(metadata['path']),
+                'artist': metadata['artist'] or 'Unknown',
+                'file_path': metadata['path']
+            }
+            for metadata in results
+        )
+        self.metadata_cache.save()
+
+    def schedule_playlist_refresh(self):
+        """Coalesce bursts of playlist changes into one redraw"""
+        if not self.playlist_refresh_pending:
+            self.playlist_refresh_pending = True
+            self.window.after(100, self._run_scheduled_playlist_refresh)
+
+    def _run_scheduled_playlist_refresh(self):
+        """Run a refresh queued by schedule_playlist_refresh"""
+        self.playlist_refresh_pending = False
         self.refresh_playlist_display()
 
     def display_rating_dialog(self):
@@ -808,65 +1012,163 @@ class ModernJukeboxInterface:
         if not self.playlist:
             return
                 
-        try:
-            selection = self.playlist_box.get("sel.first", "sel.last")
-        except Exception:
-            selection = None
-                
-        if selection:
-            selected_title = selection.strip()
-            for i, track in enumerate(self.playlist):
-                if track.title in selected_title:
-                    self.current_track_index = i
-                    break
-        elif self.current_track_index < 0:
+        if self.current_track_index < 0:
             self.current_track_index = 0
                     
         track = self.playlist[self.current_track_index]
 
+        # Initialize playback
+        self._cancel_crossfade_check()
+        self.audio_player.load_audio(track.path)
+        self.audio_player.start_playback()
+        self._handle_track_started(track)
+
+    def _continue_with_queued_track(self):
+        """Follow the mixer after it switched to the preloaded track"""
+        index = self.playlist.index_of(self.audio_player.current_song)
+        if index < 0:
+            # The queued entry was removed from the playlist meanwhile
+            self.play_next_track()
+            return
+        self.current_track_index = index
+        self._handle_track_started(self.playlist[index])
+        self.jump_to_current_track()
+
+    def _handle_track_started(self, track):
+        """Bookkeeping shared by explicit, gapless and crossfaded track starts"""
         # Check library association
-        track_path = track.path
-        track_id = None
-        
-        for key in self.music_library.library.keys():
-            if self.music_library.get_file_path(key) == track_path:
-                track_id = key
-                break
+        track_id = self.music_library.find_by_path(track.path)
         
         if track_id:
             self.music_library.increment_play_count(track_id)
             
-        # Initialize playback
-        self.audio_player.load_audio(track.path)
-        self.playback_start_time = time.time()
-        self.audio_player.current_position = 0
-        self.audio_player.start_playback()
+        self.schedule_progress_update()
             
         # Update interface
         self.now_playing_label.configure(text=f"Now playing: {track.title}")
         self.play_button.configure(text="⏸")
         self.refresh_playlist_display()
 
-    def handle_playlist_selection(self, event):
+        # Have upcoming durations ready before they are needed
+        upcoming_start = self.current_track_index + 1
+        upcoming_end = upcoming_start + config.DURATION_PREFETCH_AHEAD
+        self.prefetch_track_durations(upcoming_start, upcoming_end)
+        self.prepare_crossfade()
+        self.seek_index.prepare(track.path, track.duration)
+        self.preload_next_track()
+
+    def preload_next_track(self):
+        """Queue the next playlist entry in the mixer"""
+        next_index = self.current_track_index + 1
+        if config.GAPLESS_PLAYBACK and 0 < next_index < len(self.playlist):
+            self.audio_player.preload_next(self.playlist[next_index].path)
+
+    def _crossfade_pair(self):
+        """Get the (current, next) tracks to crossfade between, or None"""
+        next_index = self.current_track_index + 1
+        if self.crossfade_engine is None or not 0 < next_index < len(self.playlist):
+            return None
+        return self.playlist[self.current_track_index], self.playlist[next_index]
+
+    def prepare_crossfade(self):
+        """Have the crossfade into the next entry mixed in the background"""
+        pair = self._crossfade_pair()
+        if pair:
+            current_track, next_track = pair
+            self.crossfade_engine.prepare(current_track.path, current_track.duration, next_track.path)
+
+    def _schedule_crossfade_check(self, callback, delay_ms):
+        """Run a crossfade timer callback, keeping at most one pending"""
+        if self.crossfade_job is None:
+            self.crossfade_job = self.window.after(delay_ms, callback)
+
+    def _cancel_crossfade_check(self):
+        """Drop a pending crossfade timer callback"""
+        if self.crossfade_job is not None:
+            self.window.after_cancel(self.crossfade_job)
+            self.crossfade_job = None
+
+    def _check_crossfade_start(self):
+        """Start the crossfade once the current track reaches its fade point"""
+        pair = self._crossfade_pair()
+        if pair is None:
+            return
+        current_track, next_track = pair
+        plan = self.crossfade_engine.ready_plan(current_track.path, next_track.path)
+        if plan is None:
+            # Playlist order may have changed since the track started
+            self.prepare_crossfade()
+            return
+
+        until_fade = plan.start_time - self.audio_player.get_position()
+        if until_fade * 1000 <= config.PROGRESS_UPDATE_MS:
+            # Start on a precise one-shot timer rather than the next tick
+            self._schedule_crossfade_check(self._start_crossfade, max(0, int(until_fade * 1000)))
+
+    def _start_crossfade(self):
+        """Hand playback over to the next track through the mixed fade"""
+        self.crossfade_job = None
+        pair = self._crossfade_pair()
+        if pair is None or not self.audio_player.is_playing or self.audio_player.is_paused:
+            return
+        current_track, next_track = pair
+        plan = self.crossfade_engine.ready_plan(current_track.path, next_track.path)
+        if plan is None:
+            return
+
+        # Skip whatever part of the fade the timer was late for
+        offset = max(0.0, self.audio_player.get_position() - plan.start_time)
+        if offset >= plan.length:
+            # Too late; the gapless queue takes over at the track end
+            return
+
+        self.audio_player.start_crossfade(plan.sound_from(offset), next_track.path, offset, plan.length)
+        self.current_track_index += 1
+        self._handle_track_started(next_track)
+        self.jump_to_current_track()
+        self._schedule_crossfade_check(self._finish_crossfade_when_due, 0)
+
+    def _finish_crossfade_when_due(self):
+        """Unmute the next track once the fade buffer has played out"""
+        self.crossfade_job = None
+        if not self.audio_player.is_crossfading or self.audio_player.is_paused:
+            # The progress timer re-arms this check on resume
+            return
+        remaining = self.audio_player.crossfade_remaining()
+        if remaining <= 0.03:
+            self.audio_player.finish_crossfade()
+        else:
+            self._schedule_crossfade_check(self._finish_crossfade_when_due, max(5, int(remaining * 1000) - 30))
+
+    def handle_playlist_selection(self, index):
         """Handle selection of tracks in the playlist"""
-        try:
-            # Get selected line
-            index = self.playlist_box.index(f"@{event.x},{event.y}")
-            line_start = f"{int(float(index))}.0"
-            line_end = f"{int(float(index))}.end"
-            clicked_line = self.playlist_box.get(line_start, line_end)
-            
-            # Find corresponding track
-            for i, track in enumerate(self.playlist):
-                prefix = "▶ " if i == self.current_track_index else "  "
-                duration = time.strftime('%M:%S', time.gmtime(track.duration))
-                display_line = f"{prefix}{track.title} ({duration})"
-                if display_line.strip() == clicked_line.strip():
-                    self.selected_track_index = i
-                    break
-        except Exception as e:
-            print(f"Playlist selection error: {e}")
+        # Rows map 1:1 to playlist indices; remember the track itself too
+        # so a selection made stale by playlist edits is never misapplied
+        if 0 <= index < len(self.playlist):
+            self.selected_track_index = index
+            self.selected_track = self.playlist[index]
+        else:
             self.selected_track_index = -1
+            self.selected_track = None
+
+    def _apply_playlist_selection(self):
+        """Make the selected playlist row the current track, once"""
+        index = self.selected_track_index
+        if 0 <= index < len(self.playlist) and self.playlist[index] is self.selected_track:
+            self.current_track_index = index
+        self.selected_track_index = -1
+        self.selected_track = None
+        self.playlist_view.set_selection(-1)
+
+    def play_playlist_track(self, index):
+        """Play the playlist entry at index"""
+        self.handle_playlist_selection(index)
+        self._apply_playlist_selection()
+        self.start_playback()
+
+    def jump_to_current_track(self):
+        """Scroll the playlist to the track that is playing"""
+        self.playlist_view.see(self.current_track_index)
 
     def clear_playlist_contents(self):
         """Clear the entire playlist and stop playback"""
@@ -874,24 +1176,27 @@ class ModernJukeboxInterface:
             self.audio_player.suspend_playback()
         
         # Reset playlist data
-        self.playlist = []
+        self.playlist.clear()
         self.current_track_index = -1
         
         # Reset interface elements
-        self.playlist_box.delete("1.0", "end")
+        self.selected_track_index = -1
+        self.selected_track = None
+        self.playlist_view.set_selection(-1)
+        self.refresh_playlist_display()
         self.now_playing_label.configure(text="No song playing")
         self.play_button.configure(text="▶")
-        self.time_label.configure(text="0:00 / 0:00")
-        self.progress_bar.set(0)
+        self.reset_position_display()
+
+    def _format_playlist_line(self, index):
+        """Build the display line for the playlist entry at index"""
+        track = self.playlist[index]
+        prefix = "▶ " if index == self.current_track_index else "  "
+        return f"{prefix}{track.title} ({format_track_duration(track)})"
 
     def refresh_playlist_display(self):
-        """Update the playlist display"""
-        self.playlist_box.delete("1.0", "end")
-        for i, track in enumerate(self.playlist):
-            prefix = "▶ " if i == self.current_track_index else "  "
-            duration = time.strftime('%M:%S', time.gmtime(track.duration))
-            display_line = f"{prefix}{track.title} ({duration})\n"
-            self.playlist_box.insert("end", display_line)
+        """Update the playlist display (redraws only the visible rows)"""
+        self.playlist_view.refresh()
 
     def suspend_playback(self):
         """Pause or resume playback"""
@@ -900,9 +1205,9 @@ class ModernJukeboxInterface:
             self.play_button.configure(text="▶")
         else:
             # Resume from stored position
-            self.playback_start_time = time.time() - self.audio_player.current_position
             self.audio_player.start_playback()
             self.play_button.configure(text="⏸")
+            self.schedule_progress_update()
 
     def adjust_volume_level(self, value):
         """Adjust the playback volume"""
@@ -936,6 +1241,21 @@ class ModernJukeboxInterface:
         """Start the application main loop"""
         self.window.mainloop()
 
+    def shutdown_application(self):
+        """Flush pending library writes and close the window"""
+        self.metadata_prober.shutdown()
+        if self.crossfade_engine is not None:
+            self.crossfade_engine.shutdown()
+        self.seek_index.shutdown()
+        self.download_manager.shutdown()
+        self.transcoder.shutdown()
+        self.search_service.shutdown()
+        self.metadata_cache.save()
+        self.search_cache.save()
+        self.ui_dispatcher.stop()
+        self.music_library.close()
+        self.window.destroy()
+
 def main():
     """Main entry point for the Modern Jukebox application"""
     app = ModernJukeboxInterface()
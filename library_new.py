@@ -1,31 +1,380 @@
+import atexit
 import json
 import os
+import threading
+from json_store import write_json_atomic
+
+def normalize_path(path):
+    """Normalize a file path for use as a lookup key"""
+    return os.path.normcase(os.path.normpath(path))
 
 class JsonLibrary:
-    def __init__(self, json_file="02_library.json"):
+    def __init__(self, json_file="02_library.json", write_behind=False,
+                 flush_interval=2.0, flush_threshold=50, journal=False,
+                 compact_threshold=1000):
+        """
+        Initialize JSON-backed music library
+
+        Args:
+            json_file: Path of the library JSON file
+            write_behind: Batch saves on a background thread instead of
+                rewriting the file on every mutation
+            flush_interval: Seconds between background flushes
+            flush_threshold: Number of pending mutations that forces an
+                early flush
+            journal: Append each mutation to a sidecar log instead of
+                rewriting the whole file
+            compact_threshold: Number of journal records after which the
+                log is folded into a new snapshot
+        """
         self.json_file = json_file
+        self.write_behind = write_behind
+        self.flush_interval = flush_interval
+        self.flush_threshold = flush_threshold
+        self.journal = journal
+        self.compact_threshold = compact_threshold
+        self.journal_file = json_file + ".journal"
+        self.compacting_journal_file = json_file + ".journal.compacting"
+
+        self._lock = threading.RLock()
+        self._save_lock = threading.Lock()
+        self._dirty_count = 0
+        self._flush_event = threading.Event()
+        self._closed = False
+        self._flusher = None
+        self._journal_handle = None
+        self._journal_records = 0
+        self._listeners = []
+
         self.library = self._load_library()
+        if not self.journal and self._journal_records:
+            self._fold_leftover_journal()
+        self._path_index = {}
+        self._max_key = 0
+        self._rebuild_path_index()
+
+        if self.write_behind:
+            self._flusher = threading.Thread(target=self._flush_loop, daemon=True)
+            self._flusher.start()
+        if self.write_behind or self.journal:
+            atexit.register(self.close)
 
     def _load_library(self):
-        """Load library from JSON file"""
+        """Load library from JSON file and replay any journal on top"""
+        library = {}
         try:
             if os.path.exists(self.json_file):
                 with open(self.json_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-            return {}
+                    library = json.load(f)
         except Exception as e:
             print(f"Error loading library: {e}")
             return {}
 
-    def _save_library(self):
-        """Save library to JSON file"""
+        # A leftover compacting log means the last snapshot may not include
+        # it; records are absolute values so replay is safe. Journals left
+        # by an earlier journaled run are replayed even with journaling off.
+        self._journal_records = (
+            self._replay_journal(library, self.compacting_journal_file)
+            + self._replay_journal(library, self.journal_file)
+        )
+        return library
+
+    def _fold_leftover_journal(self):
+        """Save a snapshot including a leftover journal, then drop the journal"""
+        if not self._save_library():
+            return False
+        for journal_file in (self.journal_file, self.compacting_journal_file):
+            try:
+                os.remove(journal_file)
+            except FileNotFoundError:
+                pass
+            except Exception as e:
+                print(f"Error removing journal: {e}")
+        self._journal_records = 0
+        return True
+
+    def _replay_journal(self, library, journal_file):
+        """Apply journal records from a log file on top of library"""
+        count = 0
         try:
-            with open(self.json_file, 'w', encoding='utf-8') as f:
-                json.dump(self.library, f, indent=4, ensure_ascii=False)
-            return True
+            with open(journal_file, 'r', encoding='utf-8') as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        # Torn write at the tail of the log
+                        break
+                    self._apply_record(library, record)
+                    count += 1
+        except FileNotFoundError:
+            pass
         except Exception as e:
-            print(f"Error saving library: {e}")
-            return False
+            print(f"Error replaying journal: {e}")
+        return count
+
+    @staticmethod
+    def _apply_record(library, record):
+        """Apply a single journal record to library"""
+        op = record.get('op')
+        key = record.get('key')
+        if op == 'update' and key in library:
+            library[key].update(record['fields'])
+        elif op == 'add':
+            library[key] = dict(record['entry'])
+        elif op == 'add_many':
+            for entry_key, entry in record['entries'].items():
+                library[entry_key] = dict(entry)
+        elif op == 'remove':
+            library.pop(key, None)
+
+    def _append_journal(self, record):
+        """Append a record to the journal (caller holds the lock)"""
+        if self._journal_handle is None:
+            self._journal_handle = open(self.journal_file, 'a', encoding='utf-8')
+        self._journal_handle.write(json.dumps(record, ensure_ascii=False, separators=(',', ':')) + "\n")
+        self._journal_handle.flush()
+        self._journal_records += 1
+
+    def _rotate_journal(self):
+        """Move the live journal aside before a snapshot (caller holds the lock)"""
+        if self._journal_handle is not None:
+            self._journal_handle.close()
+            self._journal_handle = None
+        if not os.path.exists(self.journal_file):
+            return
+        if os.path.exists(self.compacting_journal_file):
+            # Previous compaction failed; keep its records ahead of ours
+            with open(self.journal_file, 'r', encoding='utf-8') as src, \
+                    open(self.compacting_journal_file, 'a', encoding='utf-8') as dst:
+                dst.write(src.read())
+            os.remove(self.journal_file)
+        else:
+            os.replace(self.journal_file, self.compacting_journal_file)
+        self._journal_records = 0
+
+    def _save_library(self):
+        """Save library to JSON file atomically (temp file + rename)"""
+        with self._save_lock:
+            pending = 0
+            try:
+                # Snapshot under the lock, serialize outside it. The journal
+                # is rotated together with the snapshot so records appended
+                # meanwhile stay in the live log.
+                with self._lock:
+                    snapshot = {key: dict(entry) for key, entry in self.library.items()}
+                    pending = self._dirty_count
+                    self._dirty_count = 0
+                    if self.journal:
+                        self._rotate_journal()
+
+                write_json_atomic(self.json_file, snapshot, prefix=".library-", fsync=True, indent=4)
+                if self.journal and os.path.exists(self.compacting_journal_file):
+                    os.remove(self.compacting_journal_file)
+                return True
+            except Exception as e:
+                print(f"Error saving library: {e}")
+                with self._lock:
+                    self._dirty_count += pending
+                return False
+
+    def _mark_dirty(self, record=None):
+        """Persist a mutation now, or queue it for the background flusher"""
+        if self.journal and record is not None:
+            with self._lock:
+                self._append_journal(record)
+                compaction_due = self._journal_records >= self.compact_threshold
+            if compaction_due:
+                if self.write_behind:
+                    self._flush_event.set()
+                else:
+                    self.compact()
+            return True
+
+        if not self.write_behind:
+            return self._save_library()
+
+        with self._lock:
+            self._dirty_count += 1
+            if self._dirty_count >= self.flush_threshold:
+                self._flush_event.set()
+        return True
+
+    def _flush_loop(self):
+        """Background flusher: write pending mutations in batches"""
+        while not self._closed:
+            self._flush_event.wait(self.flush_interval)
+            self._flush_event.clear()
+            if self._dirty_count or self._compaction_due():
+                self._save_library()
+
+    def _compaction_due(self):
+        """Check whether the journal has outgrown its threshold"""
+        return self.journal and self._journal_records >= self.compact_threshold
+
+    def compact(self):
+        """Fold the journal into a fresh snapshot"""
+        return self._save_library()
+
+    def flush(self):
+        """Write any pending mutations to disk immediately"""
+        if self._dirty_count:
+            return self._save_library()
+        return True
+
+    def close(self):
+        """Stop the background flusher and run a final flush"""
+        if self._closed:
+            return
+        self._closed = True
+        self._flush_event.set()
+        if self._flusher is not None and self._flusher is not threading.current_thread():
+            self._flusher.join()
+        self.flush()
+        with self._lock:
+            if self._journal_handle is not None:
+                self._journal_handle.close()
+                self._journal_handle = None
+
+    def _rebuild_path_index(self):
+        """Rebuild the normalized path -> keys index from scratch"""
+        with self._lock:
+            self._path_index = {}
+            self._max_key = 0
+            for key, entry in self.library.items():
+                self._index_path(key, entry)
+
+    def _index_path(self, key, entry):
+        """Add a track to the path index (caller holds the lock)"""
+        if key.isdigit():
+            self._max_key = max(self._max_key, int(key))
+        file_path = entry.get('file_path')
+        if file_path:
+            # Keys in insertion order; the first one wins lookups, matching
+            # the order of a linear scan
+            self._path_index.setdefault(normalize_path(file_path), []).append(key)
+
+    def _unindex_path(self, key, entry):
+        """Remove a track from the path index (caller holds the lock)"""
+        file_path = entry.get('file_path')
+        if not file_path:
+            return
+        normalized = normalize_path(file_path)
+        keys = self._path_index.get(normalized)
+        if keys is None or key not in keys:
+            return
+        keys.remove(key)
+        if not keys:
+            del self._path_index[normalized]
+
+    def find_by_path(self, file_path):
+        """Get the key of the track stored at file_path, or None"""
+        if not file_path:
+            return None
+        with self._lock:
+            keys = self._path_index.get(normalize_path(file_path))
+            return keys[0] if keys else None
+
+    def keys(self):
+        """Get all track keys"""
+        with self._lock:
+            return list(self.library.keys())
+
+    def track_summaries(self):
+        """Get (key, name, artist, rating, play_count) for every track in one pass"""
+        with self._lock:
+            return [
+                (key, entry.get('name'), entry.get('artist'),
+                 entry.get('rating', 0), entry.get('play_count', 0))
+                for key, entry in self.library.items()
+            ]
+
+    def add_listener(self, callback):
+        """Call callback with the keys of changed tracks after every mutation"""
+        self._listeners.append(callback)
+
+    def _notify(self, keys):
+        """Report changed track keys to the listeners"""
+        for callback in self._listeners:
+            try:
+                callback(keys)
+            except Exception as e:
+                print(f"Library listener error: {e}")
+
+    def _next_key(self):
+        """Get the next free numeric track key (caller holds the lock)"""
+        return str(self._max_key + 1).zfill(2)
+
+    def add_track(self, name, artist, file_path, rating=0, play_count=0):
+        """Add a new track and return its key"""
+        with self._lock:
+            key = self._next_key()
+            entry = {
+                'name': name,
+                'artist': artist,
+                'file_path': file_path,
+                'rating': rating,
+                'play_count': play_count
+            }
+            self.library[key] = entry
+            self._index_path(key, entry)
+        self._mark_dirty({'op': 'add', 'key': key, 'entry': entry})
+        self._notify([key])
+        return key
+
+    def add_tracks(self, tracks):
+        """
+        Add many tracks and persist them with a single save
+
+        Args:
+            tracks: Iterable of dicts with 'name', 'artist' and 'file_path'
+                (and optionally 'rating' and 'play_count')
+
+        Returns:
+            List of (key, added) tuples in input order; added is False when
+            the path was already in the library and key is the existing track
+        """
+        results = []
+        added = {}
+        with self._lock:
+            next_id = int(self._next_key())
+            for track in tracks:
+                existing_key = self.find_by_path(track['file_path'])
+                if existing_key is not None:
+                    results.append((existing_key, False))
+                    continue
+
+                key = str(next_id).zfill(2)
+                next_id += 1
+                entry = {
+                    'name': track.get('name') or os.path.basename(track['file_path']),
+                    'artist': track.get('artist', 'Unknown'),
+                    'file_path': track['file_path'],
+                    'rating': track.get('rating', 0),
+                    'play_count': track.get('play_count', 0)
+                }
+                self.library[key] = entry
+                self._index_path(key, entry)
+                added[key] = entry
+                results.append((key, True))
+
+        if added:
+            self._mark_dirty({'op': 'add_many', 'entries': added})
+            self._notify(list(added))
+        return results
+
+    def remove_track(self, key):
+        """Remove a track from the library"""
+        with self._lock:
+            entry = self.library.pop(key, None)
+            if entry is None:
+                return False
+            self._unindex_path(key, entry)
+        saved = self._mark_dirty({'op': 'remove', 'key': key})
+        self._notify([key])
+        return saved
 
     def get_name(self, key):
         """Get track name by key"""
@@ -65,18 +414,25 @@ class JsonLibrary:
     def increment_play_count(self, key):
         """Increment play count for a track"""
         try:
-            self.library[key]['play_count'] += 1
-            return self._save_library()
+            with self._lock:
+                self.library[key]['play_count'] += 1
+                play_count = self.library[key]['play_count']
+            saved = self._mark_dirty({'op': 'update', 'key': key, 'fields': {'play_count': play_count}})
+            self._notify([key])
+            return saved
         except KeyError:
             return False
             
     def update_rating(self, key, rating):
         """Update rating for a track"""
         try:
-            if key in self.library:
+            with self._lock:
+                if key not in self.library:
+                    return False
                 self.library[key]['rating'] = rating
-                return self._save_library()
-            return False
+            saved = self._mark_dirty({'op': 'update', 'key': key, 'fields': {'rating': rating}})
+            self._notify([key])
+            return saved
         except Exception as e:
             print(f"Error updating rating: {e}")
-            return False
\ No newline at end of file
+            return False
@@ -0,0 +1,319 @@
+import bisect
+import heapq
+import re
+import threading
+import unicodedata
+
+TOKEN_PATTERN = re.compile(r"\w+")
+
+# Query terms up to this length are answered from precomputed prefix sets
+SHORT_PREFIX_LENGTH = 2
+
+# Query terms at least this long also match tokens one typo away
+FUZZY_MIN_LENGTH = 4
+
+def tokenize(text):
+    """Split text into lowercase, accent-free word tokens"""
+    if not text:
+        return []
+    text = unicodedata.normalize("NFKD", text.casefold())
+    if not text.isascii():
+        text = "".join(c for c in text if not unicodedata.combining(c))
+    return TOKEN_PATTERN.findall(text)
+
+def single_deletes(token):
+    """The token and every variant with one character removed"""
+    return {token} | {token[:i] + token[i + 1:] for i in range(len(token))}
+
+def within_one_edit(a, b):
+    """Check whether a and b differ by at most one edit or adjacent swap"""
+    if a == b:
+        return True
+    if abs(len(a) - len(b)) > 1:
+        return False
+    if len(a) > len(b):
+        a, b = b, a
+    # Skip the common prefix, then compare what follows the first difference
+    i = 0
+    while i < len(a) and a[i] == b[i]:
+        i += 1
+    if len(a) == len(b):
+        return (a[i + 1:] == b[i + 1:]
+                or (a[i + 2:] == b[i + 2:] and a[i:i + 2] == b[i:i + 2][::-1]))
+    return a[i:] == b[i + 1:]
+
+def add_delete_variants(deletes, token):
+    """Register token under its single-delete variants in deletes"""
+    if len(token) < FUZZY_MIN_LENGTH - 1:
+        return
+    for variant in single_deletes(token):
+        deletes.setdefault(variant, set()).add(token)
+
+def track_tokens(name, artist):
+    """Get the unique search tokens of a track, name first"""
+    return tuple(dict.fromkeys(tokenize(name) + tokenize(artist)))
+
+class LibrarySearchIndex:
+    def __init__(self, library, background=False, on_ready=None):
+        """
+        Initialize the library search index
+
+        An inverted index over track names and artists supporting prefix
+        and typo-tolerant matching, ranked by match quality, rating and
+        play count. It listens to the library and re-indexes only the
+        tracks that change.
+
+        Args:
+            library: JsonLibrary or SqliteLibrary to index
+            background: Build the initial index on a worker thread; searches
+                return nothing until it is ready
+            on_ready: Called (from the building thread) once the index is built
+        """
+        self.library = library
+        self.on_ready = on_ready
+        self.ready = threading.Event()
+        self._lock = threading.RLock()
+        # Keys changed while a rebuild reads the library, or None
+        self._changed_during_build = None
+        # Token -> keys of tracks containing it
+        self._postings = {}
+        # Sorted tokens, for prefix ranges
+        self._vocabulary = []
+        # Token with one character removed -> tokens producing it
+        self._deletes = {}
+        # Prefix of up to SHORT_PREFIX_LENGTH characters -> keys
+        self._short_prefixes = {}
+        # Key -> indexed tokens
+        self._track_tokens = {}
+        # Key -> sort key (-rating, -play_count, key); _ranked holds them sorted
+        self._rank_keys = {}
+        self._ranked = []
+
+        library.add_listener(self.refresh)
+        if background:
+            threading.Thread(target=self.rebuild, daemon=True, name="library-search").start()
+        else:
+            self.rebuild()
+
+    def _read_track(self, key):
+        """Get (tokens, sort key) of a library track, or None if it is gone"""
+        name = self.library.get_name(key)
+        if name is None:
+            return None
+        tokens = track_tokens(name, self.library.get_artist(key))
+        rank_key = (-self.library.get_rating(key), -self.library.get_play_count(key), key)
+        return tokens, rank_key
+
+    def rebuild(self):
+        """
+        Index the whole library from scratch
+
+        The new index is built without holding the lock, so searches and
+        library updates are not blocked meanwhile; tracks that change during
+        the build are re-indexed once it is swapped in.
+        """
+        with self._lock:
+            self._changed_during_build = set()
+
+        try:
+            postings = {}
+            short_prefixes = {}
+            all_tokens = {}
+            rank_keys = {}
+            for key, name, artist, rating, play_count in self.library.track_summaries():
+                if name is None:
+                    continue
+                tokens = track_tokens(name, artist)
+                all_tokens[key] = tokens
+                rank_keys[key] = (-rating, -play_count, key)
+                for token in tokens:
+                    postings.setdefault(token, set()).add(key)
+                    for length in range(1, min(len(token), SHORT_PREFIX_LENGTH) + 1):
+                        short_prefixes.setdefault(token[:length], set()).add(key)
+            vocabulary = sorted(postings)
+            deletes = {}
+            for token in vocabulary:
+                add_delete_variants(deletes, token)
+            ranked = sorted(rank_keys.values())
+        except Exception as e:
+            print(f"Error building library search index: {e}")
+            with self._lock:
+                self._changed_during_build = None
+            return False
+
+        with self._lock:
+            self._postings = postings
+            self._short_prefixes = short_prefixes
+            self._track_tokens = all_tokens
+            self._rank_keys = rank_keys
+            self._vocabulary = vocabulary
+            self._deletes = deletes
+            self._ranked = ranked
+            changed, self._changed_during_build = self._changed_during_build, None
+            self._refresh_keys(changed)
+        self.ready.set()
+        if self.on_ready is not None:
+            self.on_ready()
+        return True
+
+    def refresh(self, keys):
+        """Re-index changed tracks (library listener)"""
+        with self._lock:
+            if self._changed_during_build is not None:
+                # The index is being rebuilt; catch up once it is swapped in
+                self._changed_during_build.update(keys)
+                return
+            self._refresh_keys(keys)
+
+    def _refresh_keys(self, keys):
+        """Re-index the given tracks (caller holds the lock)"""
+        for key in keys:
+            track = self._read_track(key)
+            old_tokens = self._track_tokens.get(key)
+            if track is not None and track[0] == old_tokens:
+                # Only the rating or play count changed
+                self._set_rank(key, track[1])
+                continue
+            if old_tokens is not None:
+                self._remove_track(key)
+            if track is not None:
+                self._add_track(key, *track)
+
+    def _remove_deletes(self, token):
+        """Drop token from its single-delete variants"""
+        if len(token) < FUZZY_MIN_LENGTH - 1:
+            return
+        for variant in single_deletes(token):
+            tokens = self._deletes.get(variant)
+            if tokens is not None:
+                tokens.discard(token)
+                if not tokens:
+                    del self._deletes[variant]
+
+    def _add_track(self, key, tokens, rank_key):
+        """Add a track to every index structure"""
+        self._track_tokens[key] = tokens
+        for token in tokens:
+            postings = self._postings.get(token)
+            if postings is None:
+                postings = self._postings[token] = set()
+                bisect.insort(self._vocabulary, token)
+                add_delete_variants(self._deletes, token)
+            postings.add(key)
+            for length in range(1, min(len(token), SHORT_PREFIX_LENGTH) + 1):
+                self._short_prefixes.setdefault(token[:length], set()).add(key)
+        self._rank_keys[key] = rank_key
+        bisect.insort(self._ranked, rank_key)
+
+    def _remove_track(self, key):
+        """Remove a track from every index structure"""
+        for token in self._track_tokens.pop(key):
+            postings = self._postings[token]
+            postings.discard(key)
+            if not postings:
+                del self._postings[token]
+                del self._vocabulary[bisect.bisect_left(self._vocabulary, token)]
+                self._remove_deletes(token)
+            for length in range(1, min(len(token), SHORT_PREFIX_LENGTH) + 1):
+                # Another token of the track may have emptied it already
+                keys = self._short_prefixes.get(token[:length])
+                if keys is not None:
+                    keys.discard(key)
+                    if not keys:
+                        del self._short_prefixes[token[:length]]
+        rank_key = self._rank_keys.pop(key)
+        del self._ranked[bisect.bisect_left(self._ranked, rank_key)]
+
+    def _set_rank(self, key, rank_key):
+        """Move a track to its new rating / play count position"""
+        old_rank_key = self._rank_keys[key]
+        if old_rank_key == rank_key:
+            return
+        del self._ranked[bisect.bisect_left(self._ranked, old_rank_key)]
+        bisect.insort(self._ranked, rank_key)
+        self._rank_keys[key] = rank_key
+
+    def _term_matches(self, term):
+        """
+        Get the keys matching a query term at each match level
+
+        Returns:
+            (exact, prefix, fuzzy) key sets; prefix includes exact
+        """
+        exact = self._postings.get(term, set())
+        if len(term) <= SHORT_PREFIX_LENGTH:
+            prefix = self._short_prefixes.get(term, set())
+        else:
+            start = bisect.bisect_left(self._vocabulary, term)
+            end = bisect.bisect_left(self._vocabulary, term + "\uffff")
+            tokens = self._vocabulary[start:end]
+            if len(tokens) == 1:
+                prefix = self._postings[tokens[0]]
+            else:
+                prefix = set().union(*(self._postings[token] for token in tokens))
+
+        fuzzy = set()
+        if len(term) >= FUZZY_MIN_LENGTH:
+            similar = set()
+            for variant in single_deletes(term):
+                similar.update(self._deletes.get(variant, ()))
+            for token in similar:
+                if token != term and within_one_edit(term, token):
+                    fuzzy |= self._postings[token]
+        return exact, prefix, fuzzy
+
+    def _top_ranked(self, keys, count):
+        """Get the count best-ranked keys out of keys"""
+        if count <= 0 or not keys:
+            return []
+        if len(keys) * 8 < len(self._ranked):
+            return [rank_key[2] for rank_key in heapq.nsmallest(count, map(self._rank_keys.__getitem__, keys))]
+        # Dense match: walk the global ranking until enough keys are found
+        found = []
+        for rank_key in self._ranked:
+            if rank_key[2] in keys:
+                found.append(rank_key[2])
+                if len(found) == count:
+                    break
+        return found
+
+    def search(self, query, limit=20):
+        """
+        Find tracks whose name or artist match every term of query
+
+        Each term matches tokens it equals, starts, or (for longer terms)
+        is one typo away from. Tracks where every term matches exactly come
+        first, then those where every term matches at least as a prefix,
+        then typo matches; ties are broken by rating, then play count.
+
+        Returns:
+            Up to limit track keys, best match first
+        """
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms:
+            return []
+
+        with self._lock:
+            levels = [self._term_matches(term) for term in terms]
+            # Intersect the smallest candidate sets first
+            candidates = None
+            for exact, prefix, fuzzy in sorted(levels, key=lambda level: len(level[1]) + len(level[2])):
+                matches = prefix | fuzzy if fuzzy else prefix
+                candidates = matches if candidates is None else candidates & matches
+                if not candidates:
+                    return []
+
+            # Without typo matches the candidates already match as prefixes
+            all_prefix = candidates
+            for _, prefix, fuzzy in levels:
+                if fuzzy:
+                    all_prefix = all_prefix & prefix
+            exact_sets = sorted((exact for exact, _, _ in levels), key=len)
+            all_exact = exact_sets[0] & all_prefix
+            for exact in exact_sets[1:]:
+                all_exact &= exact
+
+            results = self._top_ranked(all_exact, limit)
+            results += self._top_ranked(all_prefix - all_exact, limit - len(results))
+            results += self._top_ranked(candidates - all_prefix, limit - len(results))
+            return results
@@ -0,0 +1,286 @@
+import os
+import sqlite3
+import threading
+from library_new import JsonLibrary, normalize_path
+
+class SqliteLibrary:
+    def __init__(self, db_file="02_library.db", json_file="02_library.json"):
+        """
+        Initialize SQLite-backed music library
+
+        Args:
+            db_file: Path of the SQLite database
+            json_file: Legacy JSON library imported once into an empty database
+        """
+        self.db_file = db_file
+        self._lock = threading.RLock()
+        self._listeners = []
+        self.connection = sqlite3.connect(db_file, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self._create_schema()
+
+        if json_file and self._schema_version() == 0:
+            self.import_json(json_file)
+
+    def _create_schema(self):
+        """Create tables and indexes if they do not exist"""
+        with self._lock, self.connection:
+            self.connection.execute("""
+                CREATE TABLE IF NOT EXISTS tracks (
+                    key TEXT PRIMARY KEY,
+                    name TEXT,
+                    artist TEXT,
+                    rating INTEGER NOT NULL DEFAULT 0,
+                    play_count INTEGER NOT NULL DEFAULT 0,
+                    file_path TEXT,
+                    path_key TEXT
+                )
+            """)
+            columns = [row[1] for row in self.connection.execute("PRAGMA table_info(tracks)")]
+            if 'path_key' not in columns:
+                self._migrate_path_key()
+            self.connection.execute("CREATE INDEX IF NOT EXISTS idx_tracks_file_path ON tracks(file_path)")
+            self.connection.execute("CREATE INDEX IF NOT EXISTS idx_tracks_path_key ON tracks(path_key)")
+            self.connection.execute("CREATE INDEX IF NOT EXISTS idx_tracks_artist ON tracks(artist)")
+
+    def _migrate_path_key(self):
+        """Add and backfill the normalized path column on older databases"""
+        self.connection.execute("ALTER TABLE tracks ADD COLUMN path_key TEXT")
+        rows = self.connection.execute(
+            "SELECT key, file_path FROM tracks WHERE file_path IS NOT NULL"
+        ).fetchall()
+        self.connection.executemany(
+            "UPDATE tracks SET path_key = ? WHERE key = ?",
+            [(normalize_path(file_path), key) for key, file_path in rows]
+        )
+
+    def _schema_version(self):
+        """Get the database user_version (0 until the JSON import ran)"""
+        with self._lock:
+            return self.connection.execute("PRAGMA user_version").fetchone()[0]
+
+    def import_json(self, json_file):
+        """One-shot import of a JSON library file into the database"""
+        try:
+            # Load through JsonLibrary so updates still only in its journal
+            # are imported too; the JSON files are left untouched
+            json_library = JsonLibrary(json_file=json_file, journal=True)
+            library = json_library.library
+            json_library.close()
+
+            rows = [
+                (
+                    key,
+                    entry.get('name'),
+                    entry.get('artist'),
+                    entry.get('rating', 0),
+                    entry.get('play_count', 0),
+                    entry.get('file_path'),
+                    normalize_path(entry['file_path']) if entry.get('file_path') else None,
+                )
+                for key, entry in library.items()
+            ]
+            with self._lock, self.connection:
+                self.connection.executemany(
+                    "INSERT OR IGNORE INTO tracks (key, name, artist, rating, play_count, file_path, path_key) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    rows
+                )
+                self.connection.execute("PRAGMA user_version = 1")
+            return True
+        except Exception as e:
+            print(f"Error importing library: {e}")
+            return False
+
+    def _get_field(self, key, column, default):
+        """Read a single column for a track"""
+        try:
+            with self._lock:
+                row = self.connection.execute(
+                    f"SELECT {column} FROM tracks WHERE key = ?", (key,)
+                ).fetchone()
+            return row[0] if row else default
+        except sqlite3.Error as e:
+            print(f"Error reading library: {e}")
+            return default
+
+    def find_by_path(self, file_path):
+        """Get the key of the track stored at file_path, or None"""
+        if not file_path:
+            return None
+        with self._lock:
+            row = self.connection.execute(
+                "SELECT key FROM tracks WHERE path_key = ? ORDER BY rowid LIMIT 1",
+                (normalize_path(file_path),)
+            ).fetchone()
+        return row[0] if row else None
+
+    def keys(self):
+        """Get all track keys"""
+        with self._lock:
+            return [row[0] for row in self.connection.execute("SELECT key FROM tracks ORDER BY key")]
+
+    def track_summaries(self):
+        """Get (key, name, artist, rating, play_count) for every track in one query"""
+        try:
+            with self._lock:
+                return self.connection.execute(
+                    "SELECT key, name, artist, rating, play_count FROM tracks ORDER BY key"
+                ).fetchall()
+        except sqlite3.Error as e:
+            print(f"Error reading library: {e}")
+            return []
+
+    def add_listener(self, callback):
+        """Call callback with the keys of changed tracks after every mutation"""
+        self._listeners.append(callback)
+
+    def _notify(self, keys):
+        """Report changed track keys to the listeners"""
+        for callback in self._listeners:
+            try:
+                callback(keys)
+            except Exception as e:
+                print(f"Library listener error: {e}")
+
+    def get_name(self, key):
+        """Get track name by key"""
+        return self._get_field(key, 'name', None)
+
+    def get_artist(self, key):
+        """Get artist by key"""
+        return self._get_field(key, 'artist', None)
+
+    def get_rating(self, key):
+        """Get rating by key"""
+        return self._get_field(key, 'rating', -1)
+
+    def get_play_count(self, key):
+        """Get play count by key"""
+        return self._get_field(key, 'play_count', -1)
+
+    def get_file_path(self, key):
+        """Get file path by key"""
+        return self._get_field(key, 'file_path', None)
+
+    def add_track(self, name, artist, file_path, rating=0, play_count=0):
+        """Add a new track and return its key"""
+        try:
+            with self._lock, self.connection:
+                last = self.connection.execute(
+                    "SELECT MAX(CAST(key AS INTEGER)) FROM tracks"
+                ).fetchone()[0]
+                key = str((last or 0) + 1).zfill(2)
+                self.connection.execute(
+                    "INSERT INTO tracks (key, name, artist, rating, play_count, file_path, path_key) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (key, name, artist, rating, play_count, file_path,
+                     normalize_path(file_path) if file_path else None)
+                )
+            self._notify([key])
+            return key
+        except sqlite3.Error as e:
+            print(f"Error adding track: {e}")
+            return None
+
+    def add_tracks(self, tracks):
+        """
+        Add many tracks in a single transaction
+
+        Args:
+            tracks: Iterable of dicts with 'name', 'artist' and 'file_path'
+                (and optionally 'rating' and 'play_count')
+
+        Returns:
+            List of (key, added) tuples in input order; added is False when
+            the path was already in the library and key is the existing track
+        """
+        results = []
+        try:
+            with self._lock, self.connection:
+                last = self.connection.execute(
+                    "SELECT MAX(CAST(key AS INTEGER)) FROM tracks"
+                ).fetchone()[0]
+                next_id = (last or 0) + 1
+                for track in tracks:
+                    existing_key = self.find_by_path(track['file_path'])
+                    if existing_key is not None:
+                        results.append((existing_key, False))
+                        continue
+
+                    key = str(next_id).zfill(2)
+                    next_id += 1
+                    self.connection.execute(
+                        "INSERT INTO tracks (key, name, artist, rating, play_count, file_path, path_key) "
+                        "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                        (
+                            key,
+                            track.get('name') or os.path.basename(track['file_path']),
+                            track.get('artist', 'Unknown'),
+                            track.get('rating', 0),
+                            track.get('play_count', 0),
+                            track['file_path'],
+                            normalize_path(track['file_path']),
+                        )
+                    )
+                    results.append((key, True))
+            added_keys = [key for key, added in results if added]
+            if added_keys:
+                self._notify(added_keys)
+            return results
+        except sqlite3.Error as e:
+            print(f"Error adding tracks: {e}")
+            return []
+
+    def remove_track(self, key):
+        """Remove a track from the library"""
+        try:
+            with self._lock, self.connection:
+                cursor = self.connection.execute("DELETE FROM tracks WHERE key = ?", (key,))
+            if cursor.rowcount == 0:
+                return False
+            self._notify([key])
+            return True
+        except sqlite3.Error as e:
+            print(f"Error removing track: {e}")
+            return False
+
+    def increment_play_count(self, key):
+        """Increment play count for a track"""
+        try:
+            with self._lock, self.connection:
+                cursor = self.connection.execute(
+                    "UPDATE tracks SET play_count = play_count + 1 WHERE key = ?", (key,)
+                )
+            if cursor.rowcount == 0:
+                return False
+            self._notify([key])
+            return True
+        except sqlite3.Error as e:
+            print(f"Error updating play count: {e}")
+            return False
+
+    def update_rating(self, key, rating):
+        """Update rating for a track"""
+        try:
+            with self._lock, self.connection:
+                cursor = self.connection.execute(
+                    "UPDATE tracks SET rating = ? WHERE key = ?", (rating, key)
+                )
+            if cursor.rowcount == 0:
+                return False
+            self._notify([key])
+            return True
+        except sqlite3.Error as e:
+            print(f"Error updating rating: {e}")
+            return False
+
+    def flush(self):
+        """Changes are committed per mutation; nothing to flush"""
+        return True
+
+    def close(self):
+        """Close the database connection"""
+        with self._lock:
+            self.connection.close()
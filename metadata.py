@@ -0,0 +1,164 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import mutagen
+from json_store import LRUJsonCache
+
+# Title and artist tag names: ID3, Vorbis comments (Ogg/Opus/FLAC), MP4
+TITLE_TAGS = ('TIT2', 'title', '\xa9nam')
+ARTIST_TAGS = ('TPE1', 'artist', '\xa9ART')
+
+def _first_tag(tags, names):
+    """Get the first value of the first tag in names that is present"""
+    for name in names:
+        try:
+            value = tags[name]
+        except (KeyError, ValueError):
+            continue
+        # ID3 frames keep their values in .text; other formats use lists
+        values = getattr(value, 'text', value)
+        if values:
+            return str(values[0])
+    return None
+
+def probe_file(path, cache=None):
+    """
+    Read duration, bitrate, title and artist from an audio file
+
+    Args:
+        path: File to probe
+        cache: Optional MetadataCache consulted before touching the file
+
+    Returns:
+        Dict with 'path', 'duration', 'bitrate', 'title' and 'artist';
+        missing values are 0 / None when the file cannot be parsed
+    """
+    if cache is not None:
+        cached = cache.get(path)
+        if cached is not None:
+            return cached
+
+    metadata = {'path': path, 'duration': 0, 'bitrate': 0, 'title': None, 'artist': None}
+    try:
+        audio = mutagen.File(path)
+        if audio is None:
+            # Not a format mutagen recognizes
+            return metadata
+        metadata['duration'] = audio.info.length
+        metadata['bitrate'] = getattr(audio.info, 'bitrate', 0)
+        if audio.tags is not None:
+            metadata['title'] = _first_tag(audio.tags, TITLE_TAGS)
+            metadata['artist'] = _first_tag(audio.tags, ARTIST_TAGS)
+    except Exception:
+        return metadata
+
+    if cache is not None:
+        cache.put(path, metadata)
+    return metadata
+
+class MetadataCache(LRUJsonCache):
+    def __init__(self, cache_file="metadata_cache.json", max_entries=50000):
+        """
+        Initialize the on-disk metadata cache
+
+        Entries are keyed by path and only served while the file's size and
+        mtime still match, so edited or replaced files are probed again.
+
+        Args:
+            cache_file: Path of the JSON cache file
+            max_entries: Entries kept before the least recently used are evicted
+        """
+        super().__init__(cache_file, max_entries, name="metadata cache")
+
+    @staticmethod
+    def _cache_key(path):
+        return os.path.normcase(os.path.abspath(path))
+
+    @staticmethod
+    def _file_signature(path):
+        """Get (size, mtime_ns) for a file, or None if it is missing"""
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return [stat.st_size, stat.st_mtime_ns]
+
+    def get(self, path):
+        """Get cached metadata for path, or None if missing or stale"""
+        signature = self._file_signature(path)
+        # A changed or missing file invalidates the entry
+        entry = self._get_entry(self._cache_key(path), lambda entry: entry['signature'] == signature)
+        if entry is None:
+            return None
+        return dict(entry['metadata'], path=path)
+
+    def put(self, path, metadata):
+        """Store probed metadata for path"""
+        signature = self._file_signature(path)
+        if signature is None:
+            return
+        self._put_entry(self._cache_key(path), {'signature': signature, 'metadata': dict(metadata)})
+
+class MetadataProber:
+    def __init__(self, max_workers=8, cache=None):
+        """
+        Initialize the metadata probing pool
+
+        Args:
+            max_workers: Number of files probed concurrently
+            cache: Optional MetadataCache shared by all probes
+        """
+        self.cache = cache
+        self.executor = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix="metadata-probe"
+        )
+
+    def probe(self, path):
+        """Probe a single file in the pool and return its Future"""
+        return self.executor.submit(probe_file, path, self.cache)
+
+    def probe_many(self, paths, on_result, on_done=None):
+        """
+        Probe many files concurrently, streaming results as they finish
+
+        Args:
+            paths: File paths to probe
+            on_result: Called with each metadata dict as soon as it is
+                ready, from a worker thread
+            on_done: Called once with all metadata dicts in input order
+                after every probe has finished, from a worker thread
+        """
+        paths = list(paths)
+        results = [None] * len(paths)
+        remaining = [len(paths)]
+        lock = threading.Lock()
+
+        if not paths:
+            if on_done:
+                on_done([])
+            return []
+
+        def handle_done(index, future):
+            metadata = future.result()
+            results[index] = metadata
+            try:
+                on_result(metadata)
+            except Exception as e:
+                print(f"Metadata callback error: {e}")
+            with lock:
+                remaining[0] -= 1
+                finished = remaining[0] == 0
+            if finished and on_done:
+                on_done(results)
+
+        futures = []
+        for index, path in enumerate(paths):
+            future = self.probe(path)
+            future.add_done_callback(lambda f, i=index: handle_done(i, f))
+            futures.append(future)
+        return futures
+
+    def shutdown(self):
+        """Stop accepting work and discard queued probes"""
+        self.executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,92 @@
+from library_new import normalize_path
+
+class Playlist:
+    def __init__(self, tracks=()):
+        """
+        Initialize an ordered playlist of unique tracks
+
+        A normalized path -> position map is kept alongside the track list
+        so membership and index lookups are O(1).
+
+        Args:
+            tracks: Initial tracks; later duplicates of a path are skipped
+        """
+        self._tracks = []
+        self._index_by_path = {}
+        self.extend(tracks)
+
+    def __len__(self):
+        return len(self._tracks)
+
+    def __iter__(self):
+        return iter(self._tracks)
+
+    def __getitem__(self, index):
+        return self._tracks[index]
+
+    def __contains__(self, item):
+        """Check membership by track or by file path"""
+        path = item if isinstance(item, str) else item.path
+        return normalize_path(path) in self._index_by_path
+
+    def index_of(self, item):
+        """Get the position of a track or file path, or -1 if absent"""
+        path = item if isinstance(item, str) else item.path
+        return self._index_by_path.get(normalize_path(path), -1)
+
+    def append(self, track):
+        """Add a track at the end; returns False if its path is already queued"""
+        key = normalize_path(track.path)
+        if key in self._index_by_path:
+            return False
+        self._index_by_path[key] = len(self._tracks)
+        self._tracks.append(track)
+        return True
+
+    def extend(self, tracks):
+        """Append many tracks; returns the number actually added"""
+        return sum(1 for track in tracks if self.append(track))
+
+    def _reindex(self, start, end):
+        """Refresh stored positions for tracks in start..end"""
+        for position in range(start, end):
+            self._index_by_path[normalize_path(self._tracks[position].path)] = position
+
+    def remove_at(self, index):
+        """Remove and return the track at index"""
+        track = self._tracks.pop(index)
+        del self._index_by_path[normalize_path(track.path)]
+        self._reindex(index if index >= 0 else len(self._tracks) + index + 1, len(self._tracks))
+        return track
+
+    def remove(self, item):
+        """Remove a track or file path; returns the removed track or None"""
+        index = self.index_of(item)
+        if index < 0:
+            return None
+        return self.remove_at(index)
+
+    def move(self, old_index, new_index):
+        """
+        Move the track at old_index so it ends up at new_index
+
+        Negative indices count from the end; new_index is clamped to the
+        playlist bounds.
+        """
+        count = len(self._tracks)
+        if old_index < 0:
+            old_index += count
+        if not 0 <= old_index < count:
+            raise IndexError("playlist index out of range")
+        if new_index < 0:
+            new_index += count
+        new_index = min(max(new_index, 0), count - 1)
+
+        track = self._tracks.pop(old_index)
+        self._tracks.insert(new_index, track)
+        self._reindex(min(old_index, new_index), max(old_index, new_index) + 1)
+
+    def clear(self):
+        """Remove all tracks"""
+        self._tracks.clear()
+        self._index_by_path.clear()
@@ -0,0 +1,171 @@
+import tkinter as tk
+from tkinter import font as tkfont
+import customtkinter as ctk
+
+class VirtualPlaylistView(ctk.CTkFrame):
+    def __init__(self, parent, row_count, format_row, on_select=None, on_activate=None, **kwargs):
+        """
+        Initialize a virtualized playlist view
+
+        Only the rows inside the visible window are drawn, on a fixed pool
+        of canvas text items, so memory and redraw cost do not depend on
+        the playlist length.
+
+        Args:
+            parent: Parent widget
+            row_count: Function returning the number of playlist entries
+            format_row: Function returning the display text for an index
+            on_select: Called with the index of a clicked row
+            on_activate: Called with the index of a double-clicked row
+        """
+        super().__init__(parent, **kwargs)
+        self.row_count = row_count
+        self.format_row = format_row
+        self.on_select = on_select
+        self.on_activate = on_activate
+
+        self.top_row = 0
+        self.selected_index = -1
+        self.visible_rows = 0
+        self.row_items = []
+
+        self.row_font = tkfont.Font(family="Helvetica", size=12)
+        self.row_height = self.row_font.metrics("linespace") + 6
+
+        self.canvas = tk.Canvas(
+            self,
+            highlightthickness=0,
+            borderwidth=0,
+            bg=self._apply_appearance_mode(ctk.ThemeManager.theme["CTkTextbox"]["fg_color"])
+        )
+        self.canvas.pack(side="left", fill="both", expand=True)
+
+        self.scrollbar = ctk.CTkScrollbar(self, command=self._handle_scrollbar)
+        self.scrollbar.pack(side="right", fill="y")
+
+        self.selection_rect = self.canvas.create_rectangle(
+            0, 0, 0, 0,
+            fill=self._apply_appearance_mode(ctk.ThemeManager.theme["CTkButton"]["fg_color"]),
+            width=0,
+            state="hidden"
+        )
+
+        self._setup_bindings()
+
+    def _setup_bindings(self):
+        """Setup mouse and resize bindings"""
+        self.canvas.bind("<Configure>", lambda e: self._resize_row_pool())
+        self.canvas.bind("<Button-1>", self._handle_click)
+        self.canvas.bind("<Double-Button-1>", self._handle_double_click)
+        # Windows / macOS wheel and X11 buttons
+        self.canvas.bind("<MouseWheel>", self._handle_mouse_wheel)
+        self.canvas.bind("<Button-4>", lambda e: self.scroll_rows(-3))
+        self.canvas.bind("<Button-5>", lambda e: self.scroll_rows(3))
+
+    def _resize_row_pool(self):
+        """Match the number of canvas text items to the visible height"""
+        self.visible_rows = max(1, self.canvas.winfo_height() // self.row_height + 1)
+        text_color = self._apply_appearance_mode(ctk.ThemeManager.theme["CTkLabel"]["text_color"])
+
+        while len(self.row_items) < self.visible_rows:
+            slot = len(self.row_items)
+            item = self.canvas.create_text(
+                8, slot * self.row_height + self.row_height // 2,
+                anchor="w",
+                font=self.row_font,
+                fill=text_color
+            )
+            self.row_items.append(item)
+        while len(self.row_items) > self.visible_rows:
+            self.canvas.delete(self.row_items.pop())
+
+        self.refresh()
+
+    def refresh(self):
+        """Redraw the visible window of rows"""
+        count = self.row_count()
+        self.top_row = max(0, min(self.top_row, count - self.visible_rows + 1))
+
+        for slot, item in enumerate(self.row_items):
+            index = self.top_row + slot
+            text = self.format_row(index) if index < count else ""
+            self.canvas.itemconfigure(item, text=text)
+
+        self._place_selection()
+        self._update_scrollbar(count)
+
+    def is_row_visible(self, index):
+        """Check whether the row at index is inside the visible window"""
+        return self.top_row <= index < self.top_row + self.visible_rows
+
+    def _place_selection(self):
+        """Move the selection highlight to the selected row, if visible"""
+        if self.selected_index >= 0 and self.is_row_visible(self.selected_index):
+            slot = self.selected_index - self.top_row
+            self.canvas.coords(
+                self.selection_rect,
+                0, slot * self.row_height,
+                self.canvas.winfo_width(), (slot + 1) * self.row_height
+            )
+            self.canvas.itemconfigure(self.selection_rect, state="normal")
+            self.canvas.tag_lower(self.selection_rect)
+        else:
+            self.canvas.itemconfigure(self.selection_rect, state="hidden")
+
+    def _update_scrollbar(self, count):
+        """Sync the scrollbar thumb with the visible window"""
+        if count <= 0:
+            self.scrollbar.set(0, 1)
+            return
+        first = self.top_row / count
+        last = min(1.0, (self.top_row + self.visible_rows) / count)
+        self.scrollbar.set(first, last)
+
+    def _handle_scrollbar(self, action, amount, unit=None):
+        """Handle scrollbar drags and arrow clicks"""
+        if action == "moveto":
+            self.top_row = int(float(amount) * self.row_count())
+            self.refresh()
+        elif action == "scroll":
+            step = self.visible_rows if unit == "pages" else 1
+            self.scroll_rows(int(amount) * step)
+
+    def _handle_mouse_wheel(self, event):
+        """Scroll on mouse wheel movement"""
+        self.scroll_rows(-3 if event.delta > 0 else 3)
+
+    def scroll_rows(self, rows):
+        """Scroll the visible window by a number of rows"""
+        self.top_row = max(0, self.top_row + rows)
+        self.refresh()
+
+    def see(self, index):
+        """Scroll so the row at index is visible"""
+        if index < 0 or (self.is_row_visible(index) and index < self.top_row + self.visible_rows - 1):
+            return
+        # Center the row in the window
+        self.top_row = max(0, index - self.visible_rows // 2)
+        self.refresh()
+
+    def index_at(self, y):
+        """Get the playlist index of the row at canvas y, or -1"""
+        index = self.top_row + int(y // self.row_height)
+        return index if index < self.row_count() else -1
+
+    def set_selection(self, index):
+        """Select the row at index (-1 clears the selection)"""
+        self.selected_index = index
+        self._place_selection()
+
+    def _handle_click(self, event):
+        """Select the clicked row"""
+        index = self.index_at(event.y)
+        self.set_selection(index)
+        if self.on_select:
+            self.on_select(index)
+
+    def _handle_double_click(self, event):
+        """Activate the double-clicked row"""
+        index = self.index_at(event.y)
+        if index >= 0 and self.on_activate:
+            self.on_activate(index)
@@ -0,0 +1,121 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from json_store import LRUJsonCache
+
+def youtube_search_provider(query, max_results):
+    """
+    Search YouTube with youtube_search
+
+    Returns:
+        List of dicts with 'id', 'title', 'duration' and 'channel'
+    """
+    from youtube_search import YoutubeSearch
+    results = YoutubeSearch(query, max_results=max_results).to_dict()
+    return [
+        {
+            'id': result['id'],
+            'title': result['title'],
+            'duration': result.get('duration', 'Unknown duration'),
+            'channel': result.get('channel', 'Unknown channel'),
+        }
+        for result in results
+    ]
+
+def normalize_query(query):
+    """Normalize case and whitespace so equivalent queries share results"""
+    return " ".join(query.lower().split())
+
+class SearchCache(LRUJsonCache):
+    def __init__(self, cache_file="search_cache.json", max_entries=500, ttl=86400):
+        """
+        Initialize the on-disk search result cache
+
+        Args:
+            cache_file: Path of the JSON cache file
+            max_entries: Entries kept before the least recently used are evicted
+            ttl: Seconds a result stays valid
+        """
+        self.ttl = ttl
+        super().__init__(cache_file, max_entries, name="search cache")
+
+    def _is_valid(self, entry):
+        """Check whether a cached result is younger than the TTL"""
+        return time.time() - entry['time'] < self.ttl
+
+    def get(self, query):
+        """Get cached results for query, or None if missing or expired"""
+        entry = self._get_entry(normalize_query(query))
+        return None if entry is None else entry['results']
+
+    def put(self, query, results):
+        """Store the results for query"""
+        self._put_entry(normalize_query(query), {'time': time.time(), 'results': results})
+
+class SearchService:
+    def __init__(self, provider=youtube_search_provider, cache=None, max_results=5, max_workers=2):
+        """
+        Initialize the search service
+
+        Searches run on worker threads. Cached queries are answered
+        immediately, and a query already being fetched is not fetched
+        again; its callers all get the one result.
+
+        Args:
+            provider: Function (query, max_results) -> list of result dicts
+            cache: Optional SearchCache
+            max_results: Results requested per query
+            max_workers: Number of searches run concurrently
+        """
+        self.provider = provider
+        self.cache = cache
+        self.max_results = max_results
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="search")
+        self._lock = threading.Lock()
+        # Normalized query -> callbacks waiting for it
+        self._in_flight = {}
+
+    def search(self, query, callback):
+        """
+        Search for query and report the outcome
+
+        Args:
+            query: Search terms
+            callback: Called with (results, error); immediately on a cache
+                hit, otherwise from a worker thread
+        """
+        if self.cache is not None:
+            results = self.cache.get(query)
+            if results is not None:
+                callback(results, None)
+                return
+
+        key = normalize_query(query)
+        with self._lock:
+            if key in self._in_flight:
+                self._in_flight[key].append(callback)
+                return
+            self._in_flight[key] = [callback]
+        self.executor.submit(self._fetch, query, key)
+
+    def _fetch(self, query, key):
+        """Worker task: run the provider and notify every waiting caller"""
+        results, error = None, None
+        try:
+            results = self.provider(query, self.max_results)
+            if self.cache is not None:
+                self.cache.put(query, results)
+        except Exception as e:
+            error = e
+
+        with self._lock:
+            callbacks = self._in_flight.pop(key, [])
+        for callback in callbacks:
+            try:
+                callback(results, error)
+            except Exception as e:
+                print(f"Search callback error: {e}")
+
+    def shutdown(self):
+        """Stop accepting searches and discard queued ones"""
+        self.executor.shutdown(wait=False, cancel_futures=True)
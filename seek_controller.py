@@ -0,0 +1,78 @@
+class SeekController:
+    def __init__(self, schedule, cancel, render, seek, on_drag_start=None, on_drag_end=None, frame_ms=16):
+        """
+        Initialize the seek controller
+
+        Drag events only record the latest position; it is rendered at most
+        once per frame, and the mixer is seeked once when the drag ends.
+
+        Args:
+            schedule: Function (delay_ms, callback) -> handle, e.g. window.after
+            cancel: Function cancelling a handle, e.g. window.after_cancel
+            render: Called with the drag fraction (0-1) to update the display
+            seek: Called once with the final fraction when the drag ends
+            on_drag_start: Called when a drag begins
+            on_drag_end: Called after the final seek
+            frame_ms: Minimum interval between two renders
+        """
+        self.schedule = schedule
+        self.cancel = cancel
+        self.render = render
+        self.seek = seek
+        self.on_drag_start = on_drag_start
+        self.on_drag_end = on_drag_end
+        self.frame_ms = frame_ms
+
+        self.dragging = False
+        self.pending_fraction = None
+        self.rendered_fraction = None
+        self.frame_job = None
+
+        # Counters for benchmarking
+        self.events_received = 0
+        self.renders = 0
+        self.seeks = 0
+
+    def press(self, fraction):
+        """Begin a drag at fraction"""
+        if not self.dragging:
+            self.dragging = True
+            self.rendered_fraction = None
+            if self.on_drag_start:
+                self.on_drag_start()
+        self.move(fraction)
+
+    def move(self, fraction):
+        """Record a drag position; rendering waits for the next frame"""
+        if not self.dragging:
+            return
+        self.events_received += 1
+        self.pending_fraction = min(1.0, max(0.0, fraction))
+        if self.frame_job is None:
+            self.frame_job = self.schedule(self.frame_ms, self._render_frame)
+
+    def _render_frame(self):
+        """Render the latest drag position if it changed"""
+        self.frame_job = None
+        fraction = self.pending_fraction
+        if fraction is None or fraction == self.rendered_fraction:
+            return
+        self.rendered_fraction = fraction
+        self.renders += 1
+        self.render(fraction)
+
+    def release(self, fraction):
+        """End the drag at fraction and seek there"""
+        if not self.dragging:
+            return
+        self.move(fraction)
+        if self.frame_job is not None:
+            self.cancel(self.frame_job)
+        self._render_frame()
+
+        self.dragging = False
+        self.pending_fraction = None
+        self.seeks += 1
+        self.seek(self.rendered_fraction)
+        if self.on_drag_end:
+            self.on_drag_end()
@@ -0,0 +1,280 @@
+import mmap
+import bisect
+import hashlib
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from json_store import write_json_atomic
+
+# Layer III bitrates in kbps, by bitrate index
+MPEG1_BITRATES = (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320)
+MPEG2_BITRATES = (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160)
+
+# Sample rates by version bits (0 = MPEG 2.5, 2 = MPEG 2, 3 = MPEG 1)
+SAMPLE_RATES = {
+    0: (11025, 12000, 8000),
+    2: (22050, 24000, 16000),
+    3: (44100, 48000, 32000),
+}
+
+def parse_frame_header(data, pos):
+    """
+    Parse the MPEG Layer III frame header at pos
+
+    Returns:
+        (frame_length, frame_samples, sample_rate), or None if there is
+        no valid header at pos
+    """
+    if pos + 4 > len(data) or data[pos] != 0xFF or data[pos + 1] & 0xE0 != 0xE0:
+        return None
+    version = (data[pos + 1] >> 3) & 0x03
+    layer = (data[pos + 1] >> 1) & 0x03
+    bitrate_index = data[pos + 2] >> 4
+    rate_index = (data[pos + 2] >> 2) & 0x03
+    padding = (data[pos + 2] >> 1) & 0x01
+
+    if version == 1 or layer != 1 or bitrate_index in (0, 15) or rate_index == 3:
+        return None
+
+    sample_rate = SAMPLE_RATES[version][rate_index]
+    if version == 3:
+        bitrate = MPEG1_BITRATES[bitrate_index] * 1000
+        return 144 * bitrate // sample_rate + padding, 1152, sample_rate
+    bitrate = MPEG2_BITRATES[bitrate_index] * 1000
+    return 72 * bitrate // sample_rate + padding, 576, sample_rate
+
+def skip_id3v2(data):
+    """Get the offset of the first byte after a leading ID3v2 tag"""
+    if len(data) < 10 or data[:3] != b"ID3":
+        return 0
+    size = 0
+    for byte in data[6:10]:
+        size = (size << 7) | (byte & 0x7F)
+    footer = 10 if data[5] & 0x10 else 0
+    return 10 + size + footer
+
+def build_seek_table(path, interval=1.0):
+    """
+    Walk the MP3 frame headers of a file and record seek points
+
+    Every frame is visited, so the table is exact for CBR and VBR files
+    alike, unlike the 100-entry Xing TOC.
+
+    Args:
+        path: MP3 file to index
+        interval: Seconds between recorded seek points
+
+    Returns:
+        Dict with 'interval', 'duration', 'times' (start time of each
+        seek point's frame) and 'offsets' (its byte offset), or None if no
+        MPEG audio frames were found
+    """
+    with open(path, 'rb') as f:
+        try:
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Empty file
+            return None
+
+    with data:
+        pos = skip_id3v2(data)
+        times, offsets = [], []
+        samples = 0
+        sample_rate = None
+        next_point = 0.0
+        first_frame = True
+
+        while pos < len(data):
+            header = parse_frame_header(data, pos)
+            if header is None:
+                # Lost sync (junk or trailing tags); search the next frame
+                pos = data.find(b"\xff", pos + 1)
+                if pos < 0:
+                    break
+                continue
+
+            frame_length, frame_samples, sample_rate = header
+            if first_frame:
+                first_frame = False
+                # A Xing/Info frame carries no audio
+                if data.find(b"Xing", pos, pos + 64) >= 0 or data.find(b"Info", pos, pos + 64) >= 0:
+                    pos += frame_length
+                    continue
+
+            position = samples / sample_rate
+            if position >= next_point:
+                times.append(round(position, 4))
+                offsets.append(pos)
+                next_point += interval
+
+            samples += frame_samples
+            pos += frame_length
+
+    if not offsets:
+        return None
+    return {
+        'interval': interval,
+        'duration': samples / sample_rate,
+        'times': times,
+        'offsets': offsets,
+    }
+
+def find_seek_point(table, position):
+    """Get (byte_offset, frame_time) of the last seek point at or before position"""
+    index = max(0, bisect.bisect_right(table['times'], position) - 1)
+    return table['offsets'][index], table['times'][index]
+
+class SeekTableStore:
+    def __init__(self, directory="seek_index_cache", max_entries=200):
+        """
+        Initialize the on-disk seek table store
+
+        Each table is kept in its own file and read only when its track is
+        indexed, so nothing is loaded at startup. Tables are only served
+        while the track's size and mtime still match, and the least
+        recently used are deleted beyond max_entries.
+
+        Args:
+            directory: Directory holding one JSON file per table
+            max_entries: Tables kept before the least recently used are removed
+        """
+        self.directory = directory
+        self.max_entries = max_entries
+
+    def _table_file(self, path):
+        """Get the file storing the table for path"""
+        key = os.path.normcase(os.path.abspath(path)).encode('utf-8', 'surrogatepass')
+        return os.path.join(self.directory, hashlib.sha1(key).hexdigest() + ".json")
+
+    @staticmethod
+    def _file_signature(path):
+        """Get (size, mtime_ns) for a file, or None if it is missing"""
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return [stat.st_size, stat.st_mtime_ns]
+
+    def get(self, path):
+        """Get the stored table for path, or None if missing or stale"""
+        table_file = self._table_file(path)
+        try:
+            with open(table_file, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            print(f"Error loading seek table: {e}")
+            return None
+        if entry.get('signature') != self._file_signature(path):
+            # Track changed or disappeared since it was indexed
+            self._remove(table_file)
+            return None
+        # The file's mtime records when the table was last used
+        try:
+            os.utime(table_file)
+        except OSError:
+            pass
+        return entry['table']
+
+    def put(self, path, table):
+        """Store the table for path, removing the least recently used beyond max_entries"""
+        signature = self._file_signature(path)
+        if signature is None:
+            return False
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            write_json_atomic(
+                self._table_file(path),
+                {'path': path, 'signature': signature, 'table': table},
+                prefix=".seek-"
+            )
+        except Exception as e:
+            print(f"Error saving seek table: {e}")
+            return False
+        self._evict()
+        return True
+
+    def _evict(self):
+        """Remove the least recently used tables beyond max_entries"""
+        try:
+            with os.scandir(self.directory) as entries:
+                tables = [(entry.stat().st_mtime_ns, entry.path) for entry in entries
+                          if entry.name.endswith(".json")]
+        except OSError as e:
+            print(f"Error listing seek tables: {e}")
+            return
+        tables.sort()
+        for _, table_file in tables[:max(0, len(tables) - self.max_entries)]:
+            self._remove(table_file)
+
+    @staticmethod
+    def _remove(table_file):
+        """Delete a table file, ignoring one already gone"""
+        try:
+            os.remove(table_file)
+        except OSError:
+            pass
+
+class SeekIndex:
+    def __init__(self, cache=None, interval=1.0, min_duration=0):
+        """
+        Initialize the seek index
+
+        Tables are built on a worker thread when a track starts, so a later
+        seek only does a lookup.
+
+        Args:
+            cache: Optional SeekTableStore keeping tables across sessions
+            interval: Seconds between seek points
+            min_duration: Tracks shorter than this are not indexed
+        """
+        self.cache = cache
+        self.interval = interval
+        self.min_duration = min_duration
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="seek-index")
+        self._pending = None
+        self._pending_path = None
+
+    def prepare(self, path, duration):
+        """Start loading or building the seek table for path"""
+        if path == self._pending_path or duration < self.min_duration:
+            return
+        if not path.lower().endswith(".mp3"):
+            return
+        self._pending_path = path
+        self._pending = self.executor.submit(self._load_table, path)
+
+    def _load_table(self, path):
+        """Get the table from the cache, building and storing it if needed"""
+        if self.cache is not None:
+            table = self.cache.get(path)
+            if table is not None and table.get('interval') == self.interval:
+                return table
+
+        table = build_seek_table(path, self.interval)
+        if table is not None and self.cache is not None:
+            self.cache.put(path, table)
+        return table
+
+    def lookup(self, path, position):
+        """
+        Get the seek point for position in path without blocking
+
+        Returns:
+            (byte_offset, frame_time), or None if no table is ready
+        """
+        if path != self._pending_path or not self._pending.done():
+            return None
+        try:
+            table = self._pending.result()
+        except Exception as e:
+            print(f"Seek index error: {e}")
+            return None
+        if table is None:
+            return None
+        return find_seek_point(table, position)
+
+    def shutdown(self):
+        """Stop the worker thread"""
+        self.executor.shutdown(wait=False, cancel_futures=True)
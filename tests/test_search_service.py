@@ -0,0 +1,137 @@
+"""
+Search service tests against a local stub provider
+
+Run from the repository root:
+    python -m unittest discover tests
+"""
+import os
+import tempfile
+import threading
+import unittest
+from unittest import mock
+from search_service import SearchCache, SearchService
+
+class StubProvider:
+    """Search provider returning canned results and counting calls"""
+    def __init__(self, gate=None):
+        self.calls = []
+        self.gate = gate
+
+    def __call__(self, query, max_results):
+        self.calls.append(query)
+        if self.gate is not None:
+            self.gate.wait(5)
+        return [{'id': f"id-{query}", 'title': query, 'duration': "1:00", 'channel': "Stub"}]
+
+class SearchCacheTests(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.cache_file = os.path.join(self.directory.name, "search_cache.json")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_hit_ignores_case_and_spacing(self):
+        cache = SearchCache(self.cache_file)
+        cache.put("Daft  Punk", ["result"])
+        self.assertEqual(cache.get("daft punk"), ["result"])
+
+    def test_entry_expires_after_ttl(self):
+        cache = SearchCache(self.cache_file, ttl=60)
+        with mock.patch("search_service.time.time", return_value=1000.0):
+            cache.put("query", ["result"])
+        with mock.patch("search_service.time.time", return_value=1059.0):
+            self.assertEqual(cache.get("query"), ["result"])
+        with mock.patch("search_service.time.time", return_value=1060.0):
+            self.assertIsNone(cache.get("query"))
+
+    def test_least_recently_used_entry_is_evicted(self):
+        cache = SearchCache(self.cache_file, max_entries=2)
+        cache.put("first", [1])
+        cache.put("second", [2])
+        cache.get("first")
+        cache.put("third", [3])
+        self.assertIsNone(cache.get("second"))
+        self.assertEqual(cache.get("first"), [1])
+        self.assertEqual(cache.get("third"), [3])
+
+    def test_entries_persist_across_reload(self):
+        cache = SearchCache(self.cache_file)
+        cache.put("query", ["result"])
+        self.assertTrue(cache.save())
+        reloaded = SearchCache(self.cache_file)
+        self.assertEqual(reloaded.get("query"), ["result"])
+
+    def test_expired_entries_are_dropped_on_reload(self):
+        with mock.patch("search_service.time.time", return_value=1000.0):
+            cache = SearchCache(self.cache_file, ttl=60)
+            cache.put("query", ["result"])
+            cache.save()
+        with mock.patch("search_service.time.time", return_value=2000.0):
+            reloaded = SearchCache(self.cache_file, ttl=60)
+        self.assertEqual(len(reloaded.entries), 0)
+
+class SearchServiceTests(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.cache = SearchCache(os.path.join(self.directory.name, "search_cache.json"))
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_concurrent_searches_share_one_provider_call(self):
+        gate = threading.Event()
+        provider = StubProvider(gate)
+        service = SearchService(provider=provider, cache=self.cache)
+        finished = threading.Event()
+        outcomes = []
+
+        def callback(results, error):
+            outcomes.append((results, error))
+            if len(outcomes) == 2:
+                finished.set()
+
+        service.search("lofi beats", callback)
+        service.search("LoFi  Beats", callback)
+        gate.set()
+        self.assertTrue(finished.wait(5))
+        service.shutdown()
+
+        self.assertEqual(provider.calls, ["lofi beats"])
+        self.assertEqual(len(outcomes), 2)
+        self.assertEqual(outcomes[0], outcomes[1])
+        self.assertIsNone(outcomes[0][1])
+
+    def test_cached_query_skips_provider(self):
+        provider = StubProvider()
+        service = SearchService(provider=provider, cache=self.cache)
+        self.cache.put("query", ["cached"])
+        outcomes = []
+        service.search("query", lambda results, error: outcomes.append((results, error)))
+        service.shutdown()
+
+        self.assertEqual(provider.calls, [])
+        self.assertEqual(outcomes, [(["cached"], None)])
+
+    def test_provider_error_reaches_callback(self):
+        def failing_provider(query, max_results):
+            raise RuntimeError("offline")
+
+        service = SearchService(provider=failing_provider, cache=self.cache)
+        finished = threading.Event()
+        outcomes = []
+
+        def callback(results, error):
+            outcomes.append((results, error))
+            finished.set()
+
+        service.search("query", callback)
+        self.assertTrue(finished.wait(5))
+        service.shutdown()
+
+        self.assertIsNone(outcomes[0][0])
+        self.assertIsInstance(outcomes[0][1], RuntimeError)
+        self.assertIsNone(self.cache.get("query"))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,95 @@
+import multiprocessing
+import os
+import subprocess
+from concurrent.futures import ProcessPoolExecutor
+
+# Output codecs: file extension, source codecs that can be copied without
+# re-encoding, FFmpeg encoder and the yt-dlp format preferred for the codec
+OUTPUT_CODECS = {
+    'mp3': {
+        'ext': '.mp3',
+        'copy_from': ('mp3',),
+        'encoder': 'libmp3lame',
+        'format': 'bestaudio/best',
+    },
+    'opus': {
+        'ext': '.opus',
+        'copy_from': ('opus',),
+        'encoder': 'libopus',
+        'format': 'bestaudio[acodec=opus]/bestaudio/best',
+    },
+    'm4a': {
+        'ext': '.m4a',
+        'copy_from': ('aac', 'mp4a'),
+        'encoder': 'aac',
+        'format': 'bestaudio[ext=m4a]/bestaudio/best',
+    },
+}
+
+def transcode_audio(source_path, codec="mp3", source_codec=None, bitrate="192k"):
+    """
+    Convert a downloaded file to codec with FFmpeg
+
+    When the source already uses the codec the audio stream is copied into
+    the output container instead of being re-encoded. The source file is
+    removed once the output is complete.
+
+    Args:
+        source_path: Downloaded file
+        codec: Key of OUTPUT_CODECS
+        source_codec: Codec of the source audio as reported by yt-dlp
+            (e.g. 'opus' or 'mp4a.40.2'), if known
+        bitrate: Bitrate used when re-encoding
+
+    Returns:
+        Path of the output file
+    """
+    profile = OUTPUT_CODECS[codec]
+    base, source_ext = os.path.splitext(source_path)
+    copy = bool(source_codec) and source_codec.split('.')[0].lower() in profile['copy_from']
+    if source_ext.lower() == profile['ext']:
+        if copy:
+            # Already in the wanted codec and container
+            return source_path
+        output_path = base + ".transcoding" + profile['ext']
+    else:
+        output_path = base + profile['ext']
+
+    if copy:
+        codec_args = ['-codec:a', 'copy']
+    else:
+        codec_args = ['-codec:a', profile['encoder'], '-b:a', bitrate]
+
+    command = ['ffmpeg', '-y', '-v', 'error', '-i', source_path, '-vn', '-map_metadata', '0']
+    subprocess.run(command + codec_args + [output_path], capture_output=True, check=True)
+
+    if source_ext.lower() == profile['ext']:
+        os.replace(output_path, source_path)
+        return source_path
+    os.remove(source_path)
+    return output_path
+
+class Transcoder:
+    def __init__(self, max_workers=None):
+        """
+        Initialize the transcode process pool
+
+        FFmpeg jobs are scheduled independently of the downloads that
+        produced their input, at most one per CPU core by default.
+
+        Args:
+            max_workers: Number of concurrent transcodes (default: CPU count)
+        """
+        # Spawn rather than fork the GUI process with its threads
+        self.executor = ProcessPoolExecutor(
+            max_workers=max_workers or os.cpu_count() or 1,
+            mp_context=multiprocessing.get_context("spawn")
+        )
+
+    def submit(self, source_path, codec="mp3", source_codec=None, bitrate="192k"):
+        """Queue a transcode and return the Future of its output path"""
+        return self.executor.submit(transcode_audio, source_path, codec, source_codec, bitrate)
+
+    def shutdown(self):
+        """Stop the worker processes, discarding queued transcodes"""
+        self.executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,59 @@
+import itertools
+import threading
+from collections import OrderedDict
+
+class UIDispatcher:
+    def __init__(self, window, frame_ms=33):
+        """
+        Initialize the cross-thread UI update queue
+
+        Worker threads post updates instead of calling window.after
+        themselves. The Tk thread drains the queue once per frame, so a
+        burst of updates costs one timer callback, and updates posted under
+        the same key are coalesced to the latest one.
+
+        Args:
+            window: Tk window whose main loop runs the updates
+            frame_ms: Interval between two drains
+        """
+        self.window = window
+        self.frame_ms = frame_ms
+        self._lock = threading.Lock()
+        self._pending = OrderedDict()
+        self._unique_keys = itertools.count()
+        self.drain_job = None
+
+    def post(self, key, callback, *args):
+        """
+        Queue callback(*args) for the Tk thread, replacing any update
+        still pending under the same key (e.g. one key per widget)
+        """
+        with self._lock:
+            self._pending.pop(key, None)
+            self._pending[key] = (callback, args)
+
+    def call(self, callback, *args):
+        """Queue callback(*args) for the Tk thread without coalescing"""
+        self.post(("call", next(self._unique_keys)), callback, *args)
+
+    def start(self):
+        """Start draining the queue on the Tk thread"""
+        if self.drain_job is None:
+            self.drain_job = self.window.after(self.frame_ms, self._drain)
+
+    def stop(self):
+        """Stop draining the queue"""
+        if self.drain_job is not None:
+            self.window.after_cancel(self.drain_job)
+            self.drain_job = None
+
+    def _drain(self):
+        """Run every queued update in posting order"""
+        with self._lock:
+            pending, self._pending = self._pending, OrderedDict()
+        for callback, args in pending.values():
+            try:
+                callback(*args)
+            except Exception as e:
+                print(f"UI update error: {e}")
+        self.drain_job = self.window.after(self.frame_ms, self._drain)